@@ -1,215 +1,573 @@
 # database.py
+import os
+import queue
 import sqlite3
+import logging
+import threading
+from contextlib import contextmanager
+from functools import lru_cache
 from datetime import datetime
 
+logger = logging.getLogger("POS_System.Database")
+
+# Statement cache size per connection; every query below is a fixed string
+# so repeated calls reuse the compiled statement instead of re-preparing it
+_STATEMENT_CACHE_SIZE = 256
+
+# Maximum number of product rows kept in the per-database barcode cache
+_BARCODE_CACHE_SIZE = 512
+# Result sets of repeated listing queries kept between writes
+_QUERY_CACHE_SIZE = 32
+
+_SQL_INSERT_PRODUCT = """
+INSERT INTO products (barcode, name, price, quantity_in_stock)
+VALUES (?, ?, ?, ?)
+"""
+_SQL_UPSERT_PRODUCT = """
+INSERT INTO products (barcode, name, price, quantity_in_stock)
+VALUES (?, ?, ?, ?)
+ON CONFLICT(barcode) DO UPDATE SET
+    name = excluded.name,
+    price = excluded.price,
+    quantity_in_stock = excluded.quantity_in_stock
+"""
+_SQL_UPSERT_PRODUCT_RETURNING = _SQL_UPSERT_PRODUCT + "RETURNING id\n"
+_SQL_GET_BY_BARCODE = "SELECT * FROM products WHERE barcode = ?"
+_SQL_GET_BY_ID = "SELECT * FROM products WHERE id = ?"
+_SQL_DELETE_PRODUCT = "DELETE FROM products WHERE id = ?"
+# Prefix and substring searches share one statement: given a trailing-
+# wildcard pattern, LIKE can range-scan idx_products_name and
+# idx_products_barcode_nocase (NOCASE, matching LIKE's case folding), so
+# the OR becomes a union of two index seeks and barcodes still match
+# whatever case the keyword is typed in
+_SQL_SEARCH_PRODUCTS = """
+SELECT * FROM products
+WHERE name LIKE ? OR barcode LIKE ?
+"""
+# Characters with special meaning to LIKE; keywords containing any of them
+# (beyond a trailing '%') take the substring path so they are never misread
+# as patterns. case_sensitive_like is deliberately left off: the NOCASE
+# indexes serve case-insensitive prefix LIKE.
+_WILDCARD_CHARS = frozenset("%_")
+_SQL_UPDATE_PRODUCT = """
+UPDATE products
+SET name = ?, price = ?, quantity_in_stock = ?
+WHERE id = ?
+"""
+_SQL_ADJUST_STOCK = """
+UPDATE products
+SET quantity_in_stock = quantity_in_stock + ?
+WHERE id = ? AND quantity_in_stock + ? >= 0
+RETURNING quantity_in_stock
+"""
+_SQL_LIST_INVENTORY = "SELECT * FROM products"
+_SQL_INSERT_SALE = "INSERT INTO sales (timestamp, total) VALUES (?, ?)"
+_SQL_INSERT_SALE_ITEM = """
+INSERT INTO sale_items (sale_id, product_id, quantity, line_total)
+VALUES (?, ?, ?, ?)
+"""
+_SQL_GET_SALE = "SELECT * FROM sales WHERE id = ?"
+_SQL_GET_SALE_ITEMS = """
+SELECT si.*, p.name, p.barcode, p.price
+FROM sale_items si
+JOIN products p ON si.product_id = p.id
+WHERE si.sale_id = ?
+"""
+# Range-scans idx_products_stock, which also yields the rows in order
+_SQL_LOW_STOCK = """
+SELECT * FROM products
+WHERE quantity_in_stock <= ?
+ORDER BY quantity_in_stock ASC
+"""
+_SQL_INVENTORY_SUMMARY = """
+SELECT COUNT(*) AS total_items,
+    COALESCE(SUM(price * quantity_in_stock), 0) AS total_value
+FROM products
+"""
+_SQL_LIST_SALES = "SELECT * FROM sales{where} ORDER BY timestamp DESC"
+_SQL_LIST_SALES_COUNTED = """
+SELECT s.*,
+    (SELECT COALESCE(SUM(quantity), 0) FROM sale_items WHERE sale_id = s.id) AS item_count
+FROM sales s{where} ORDER BY timestamp DESC
+"""
+_SQL_SALES_SUMMARY = """
+SELECT COALESCE(SUM(total), 0) AS total, COUNT(*) AS count, COALESCE(AVG(total), 0) AS avg,
+    MIN(timestamp) AS first_ts, MAX(timestamp) AS last_ts
+FROM sales{where}
+"""
+# Units sold per product are summed by the GROUP BY, so report code never
+# tallies line items in Python
+_SQL_BEST_SELLER = """
+SELECT p.name
+FROM sales s
+JOIN sale_items si ON si.sale_id = s.id
+JOIN products p ON p.id = si.product_id{where}
+GROUP BY si.product_id ORDER BY SUM(si.quantity) DESC LIMIT 1
+"""
+_SQL_SALE_LINES = """
+SELECT s.id AS sale_id, s.timestamp, p.name AS product_name, si.quantity, si.line_total
+FROM sales s
+JOIN sale_items si ON si.sale_id = s.id
+LEFT JOIN products p ON p.id = si.product_id{where}
+ORDER BY s.timestamp DESC, s.id
+"""
+# Per-product units and revenue for the Product Summary export; the SUMs run
+# in SQLite's C aggregate code over idx_sales_ts's range, so there is no
+# per-line Python loop left to speed up
+_SQL_PRODUCT_SALES = """
+SELECT p.name AS product_name, SUM(si.quantity) AS quantity, SUM(si.line_total) AS total
+FROM sales s
+JOIN sale_items si ON si.sale_id = s.id
+LEFT JOIN products p ON p.id = si.product_id{where}
+GROUP BY si.product_id ORDER BY p.name
+"""
+# Sale timestamps are ISO text, so the day is the first ten characters; a
+# substring avoids date() parsing every row
+_SQL_SALES_BY_DATE = """
+SELECT
+    substr(timestamp, 1, 10) as sale_date,
+    COUNT(*) as num_transactions,
+    SUM(total) as total_sales
+FROM sales{where}
+GROUP BY sale_date ORDER BY sale_date DESC
+"""
+
+# WHERE clauses for optional (date_from, date_to) filters, keyed on which
+# bounds are present. Timestamps are ISO text, so both bounds compare as
+# strings and range-scan idx_sales_ts; the end bound is exclusive
+_DATE_FILTERS = {
+    (True, True): " WHERE timestamp >= ? AND timestamp < ?",
+    (True, False): " WHERE timestamp >= ?",
+    (False, True): " WHERE timestamp < ?",
+    (False, False): "",
+}
+_SQL_LIST_SALES_BY_FILTER = {k: _SQL_LIST_SALES.format(where=w) for k, w in _DATE_FILTERS.items()}
+_SQL_SALES_BY_DATE_BY_FILTER = {k: _SQL_SALES_BY_DATE.format(where=w) for k, w in _DATE_FILTERS.items()}
+_SQL_LIST_SALES_COUNTED_BY_FILTER = {k: _SQL_LIST_SALES_COUNTED.format(where=w) for k, w in _DATE_FILTERS.items()}
+_SQL_SALES_SUMMARY_BY_FILTER = {k: _SQL_SALES_SUMMARY.format(where=w) for k, w in _DATE_FILTERS.items()}
+_SQL_BEST_SELLER_BY_FILTER = {k: _SQL_BEST_SELLER.format(where=w) for k, w in _DATE_FILTERS.items()}
+_SQL_SALE_LINES_BY_FILTER = {k: _SQL_SALE_LINES.format(where=w) for k, w in _DATE_FILTERS.items()}
+_SQL_PRODUCT_SALES_BY_FILTER = {k: _SQL_PRODUCT_SALES.format(where=w) for k, w in _DATE_FILTERS.items()}
+
+
+@lru_cache(maxsize=256)
+def _compile_search(keyword, substring=False):
+    """
+    Translate a search keyword into the statement and parameters to run.
+    Plain keywords, and keywords whose only wildcard is a trailing '%',
+    become index-friendly prefix patterns; anything else becomes a substring
+    pattern. Both run the same statement.
+    """
+    stem = keyword[:-1] if keyword.endswith("%") else keyword
+    if not substring and not _WILDCARD_CHARS.intersection(stem):
+        return _SQL_SEARCH_PRODUCTS, (f"{stem}%", f"{stem}%")
+    kw = keyword if keyword.startswith("%") else f"%{keyword}"
+    if not kw.endswith("%"):
+        kw += "%"
+    return _SQL_SEARCH_PRODUCTS, (kw, kw)
+
+
+def _dictify(cur):
+    """Turn the remaining rows of an executed cursor into a list of dicts."""
+    cols = [d[0] for d in cur.description]
+    return [dict(zip(cols, r)) for r in cur]
+
+
+def _date_params(date_from, date_to):
+    """Return the statement key and bound parameters for a date range filter."""
+    key = (bool(date_from), bool(date_to))
+    return key, [d for d in (date_from, date_to) if d]
+
 class Database:
     """
-    Manages SQLite connection and provides methods to manipulate
+    Manages SQLite connections and provides methods to manipulate
     products and sales tables.
+
+    Writes go through a single writer connection guarded by a lock, while
+    reads are served from a pool of read-only connections so the UI can
+    query inventory while a checkout is being written.
     """
-    def __init__(self, db_name: str = "pos.db"):
-        self.conn = sqlite3.connect(db_name)
-        self.conn.row_factory = sqlite3.Row
+    def __init__(self, db_name: str = "pos.db", readers: int = None):
+        self.db_name = db_name
+        self._write_lock = threading.RLock()
+        # Barcode -> product row, for repeated scans of the same item
+        self._barcode_cache = {}
+        # (sql, params) -> rows, for listing queries repeated between writes
+        self._query_cache = {}
+        self._cache_version = 0
+        # Makes a reader's version check and cache store atomic with
+        # respect to a writer's version bump and cache clear
+        self._cache_lock = threading.Lock()
+        self._writer = self._connect(db_name)
         self._create_tables()
 
-    def _create_tables(self):
-        cur = self.conn.cursor()
-        # Products table
-        cur.execute("""
-        CREATE TABLE IF NOT EXISTS products (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            barcode TEXT UNIQUE,
-            name TEXT,
-            price REAL,
-            quantity_in_stock INTEGER
-        )
-        """)
-        # Sales master table
-        cur.execute("""
-        CREATE TABLE IF NOT EXISTS sales (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            timestamp TEXT,
-            total REAL
-        )
-        """)
-        # Sale items (line items)
-        cur.execute("""
-        CREATE TABLE IF NOT EXISTS sale_items (
-            sale_id INTEGER,
-            product_id INTEGER,
-            quantity INTEGER,
-            line_total REAL,
-            FOREIGN KEY(sale_id) REFERENCES sales(id),
-            FOREIGN KEY(product_id) REFERENCES products(id)
-        )
+        # An in-memory database is private to its connection, so reads
+        # have to share the writer there
+        self._readers = None
+        if db_name != ":memory:":
+            self._readers = queue.Queue()
+            for _ in range(readers or os.cpu_count() or 2):
+                self._readers.put(self._connect(f"file:{db_name}?mode=ro", uri=True))
+
+    def _connect(self, target, uri=False):
+        # isolation_level=None leaves transactions to _transaction(), which
+        # takes the write lock with BEGIN IMMEDIATE instead of upgrading a
+        # deferred transaction mid-write
+        conn = sqlite3.connect(target, uri=uri, isolation_level=None,
+                               check_same_thread=False,
+                               cached_statements=_STATEMENT_CACHE_SIZE)
+        conn.row_factory = sqlite3.Row
+        self._apply_pragmas(conn)
+        return conn
+
+    def _apply_pragmas(self, conn):
+        """Tune the connection for concurrent UI reads and checkout writes."""
+        if self.db_name != ":memory:":
+            # journal_mode returns the mode actually in effect
+            mode = conn.execute("PRAGMA journal_mode=WAL").fetchone()[0]
+            if mode.lower() != "wal":
+                logger.warning(f"WAL journal mode unavailable, using {mode}")
+        conn.executescript("""
+        PRAGMA synchronous=NORMAL;
+        PRAGMA busy_timeout=5000;
+        PRAGMA cache_size=-20000;
+        PRAGMA temp_store=MEMORY;
+        PRAGMA foreign_keys=ON;
+        PRAGMA mmap_size=268435456;
         """)
-        self.conn.commit()
+
+    @contextmanager
+    def _read(self):
+        """Check out a read-only connection for the duration of the block."""
+        if self._readers is None:
+            with self._write_lock:
+                yield self._writer
+            return
+        conn = self._readers.get()
+        try:
+            yield conn
+        finally:
+            self._readers.put(conn)
+
+    @contextmanager
+    def _write(self):
+        """
+        Hold the writer connection exclusively for the duration of the block.
+        Any write may change a cached product, so the barcode and query
+        caches are invalidated when the block exits.
+        """
+        with self._write_lock:
+            try:
+                yield self._writer
+            finally:
+                with self._cache_lock:
+                    self._cache_version += 1
+                    self._barcode_cache.clear()
+                    self._query_cache.clear()
+
+    def _cached_query(self, sql, params=()):
+        """Run a read query, reusing its rows until the next write."""
+        key = (sql, params)
+        rows = self._query_cache.get(key)
+        if rows is None:
+            # Only cache the rows if no write happened while they were read
+            version = self._cache_version
+            with self._read() as conn:
+                rows = conn.execute(sql, params).fetchall()
+            with self._cache_lock:
+                if version == self._cache_version:
+                    if len(self._query_cache) >= _QUERY_CACHE_SIZE:
+                        # Evict the oldest entry
+                        self._query_cache.pop(next(iter(self._query_cache)), None)
+                    self._query_cache[key] = rows
+        # Callers get their own list so they cannot alter the cached one
+        return list(rows)
+
+    @contextmanager
+    def _transaction(self):
+        """Run the block as a single write transaction on the writer connection."""
+        with self._write() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+
+    def _create_tables(self):
+        with self._write() as conn:
+            cur = conn.cursor()
+            # Products table
+            cur.execute("""
+            CREATE TABLE IF NOT EXISTS products (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                barcode TEXT UNIQUE,
+                name TEXT,
+                price REAL,
+                quantity_in_stock INTEGER
+            )
+            """)
+            # Sales master table
+            cur.execute("""
+            CREATE TABLE IF NOT EXISTS sales (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                timestamp TEXT,
+                total REAL
+            )
+            """)
+            # Sale items (line items)
+            cur.execute("""
+            CREATE TABLE IF NOT EXISTS sale_items (
+                sale_id INTEGER,
+                product_id INTEGER,
+                quantity INTEGER,
+                line_total REAL,
+                FOREIGN KEY(sale_id) REFERENCES sales(id),
+                FOREIGN KEY(product_id) REFERENCES products(id)
+            )
+            """)
+            # Selling an item takes it out of stock inside the same statement,
+            # so recording a sale needs no per-item UPDATE from Python
+            cur.execute("""
+            CREATE TRIGGER IF NOT EXISTS trg_sale_items_stock
+            AFTER INSERT ON sale_items
+            BEGIN
+                UPDATE products
+                SET quantity_in_stock = quantity_in_stock - NEW.quantity
+                WHERE id = NEW.product_id AND quantity_in_stock >= NEW.quantity;
+            END
+            """)
+            # Indexes for the hot lookup, search and report paths
+            cur.execute("CREATE INDEX IF NOT EXISTS idx_products_name ON products(name COLLATE NOCASE)")
+            cur.execute("CREATE INDEX IF NOT EXISTS idx_products_barcode_nocase ON products(barcode COLLATE NOCASE)")
+            cur.execute("CREATE INDEX IF NOT EXISTS idx_products_stock ON products(quantity_in_stock)")
+            cur.execute("CREATE INDEX IF NOT EXISTS idx_sales_ts ON sales(timestamp DESC)")
+            cur.execute("CREATE INDEX IF NOT EXISTS idx_sale_items_sale ON sale_items(sale_id)")
+            cur.execute("CREATE INDEX IF NOT EXISTS idx_sale_items_product ON sale_items(product_id)")
+
+            # Gather planner statistics once; afterwards PRAGMA optimize
+            # refreshes them only when they have gone stale
+            has_stats = cur.execute(
+                "SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'"
+            ).fetchone()
+            if has_stats:
+                cur.execute("PRAGMA optimize")
+            else:
+                cur.execute("ANALYZE")
 
     # Product operations
     def add_product(self, barcode: str, name: str, price: float, qty: int):
-        """Insert a new product; barcode must be unique."""
-        cur = self.conn.cursor()
-        cur.execute("""
-        INSERT INTO products (barcode, name, price, quantity_in_stock)
-        VALUES (?, ?, ?, ?)
-        """, (barcode, name, price, qty))
-        self.conn.commit()
+        """Insert a new product and return its id; barcode must be unique."""
+        with self._transaction() as conn:
+            cur = conn.cursor()
+            cur.execute(_SQL_INSERT_PRODUCT, (barcode, name, price, qty))
+            return cur.lastrowid
+
+    def upsert_products(self, rows):
+        """
+        Insert or update (barcode, name, price, qty) rows in one transaction,
+        matching existing products by barcode.
+        """
+        with self._transaction() as conn:
+            conn.executemany(_SQL_UPSERT_PRODUCT, rows)
+
+    def upsert_product(self, barcode: str, name: str, price: float, qty: int):
+        """
+        Insert a product, or update the one with this barcode, in a single
+        statement; returns the product id either way.
+        """
+        with self._transaction() as conn:
+            cur = conn.cursor()
+            cur.execute(_SQL_UPSERT_PRODUCT_RETURNING, (barcode, name, price, qty))
+            return cur.fetchall()[0][0]
 
     def get_product_by_barcode(self, barcode: str):
-        """Fetch a product row by barcode."""
-        cur = self.conn.cursor()
-        cur.execute("SELECT * FROM products WHERE barcode = ?", (barcode,))
-        return cur.fetchone()
+        """Fetch a product row by barcode, served from cache when possible."""
+        row = self._barcode_cache.get(barcode)
+        if row is not None:
+            return row
+        # Only cache the row if no write happened while it was being read
+        version = self._cache_version
+        with self._read() as conn:
+            cur = conn.cursor()
+            cur.execute(_SQL_GET_BY_BARCODE, (barcode,))
+            row = cur.fetchone()
+        if row is not None:
+            with self._cache_lock:
+                if version == self._cache_version:
+                    if len(self._barcode_cache) >= _BARCODE_CACHE_SIZE:
+                        # Evict the oldest entry
+                        self._barcode_cache.pop(next(iter(self._barcode_cache)), None)
+                    self._barcode_cache[barcode] = row
+        return row
         
     def get_product_by_id(self, product_id: int):
         """Fetch a product row by ID."""
-        cur = self.conn.cursor()
-        cur.execute("SELECT * FROM products WHERE id = ?", (product_id,))
-        row = cur.fetchone()
+        with self._read() as conn:
+            cur = conn.cursor()
+            cur.execute(_SQL_GET_BY_ID, (product_id,))
+            row = cur.fetchone()
         return dict(row) if row else None
         
     def delete_product(self, product_id: int):
-        """Delete a product from the database."""
-        cur = self.conn.cursor()
-        cur.execute("DELETE FROM products WHERE id = ?", (product_id,))
-        self.conn.commit()
+        """
+        Delete a product from the database.
+        Raises ValueError if the product has been sold: foreign_keys=ON
+        keeps its sale_items, and so past receipts and reports, intact.
+        """
+        try:
+            with self._transaction() as conn:
+                cur = conn.cursor()
+                cur.execute(_SQL_DELETE_PRODUCT, (product_id,))
+        except sqlite3.IntegrityError:
+            raise ValueError("This product has sales history and cannot be deleted. "
+                             "Set its stock to 0 instead.") from None
         return cur.rowcount > 0  # Return True if a row was deleted
 
-    def search_products(self, keyword: str):
-        """Search products by name or barcode."""
-        cur = self.conn.cursor()
-        kw = f"%{keyword}%"
-        cur.execute("""
-        SELECT * FROM products
-        WHERE name LIKE ? OR barcode LIKE ?
-        """, (kw, kw))
-        return cur.fetchall()
+    def search_products(self, keyword: str, substring: bool = False):
+        """
+        Search products whose name or barcode starts with keyword.
+        Pass substring=True, or start the keyword with '%', to match
+        anywhere in the name or barcode instead (this cannot use an index).
+        """
+        sql, params = _compile_search(keyword, substring)
+        with self._read() as conn:
+            cur = conn.cursor()
+            cur.execute(sql, params)
+            return cur.fetchall()
 
     def update_product(self, product_id: int, name: str, price: float, qty: int):
         """Update product details."""
-        cur = self.conn.cursor()
-        cur.execute("""
-        UPDATE products
-        SET name = ?, price = ?, quantity_in_stock = ?
-        WHERE id = ?
-        """, (name, price, qty, product_id))
-        self.conn.commit()
+        with self._transaction() as conn:
+            cur = conn.cursor()
+            cur.execute(_SQL_UPDATE_PRODUCT, (name, price, qty, product_id))
 
     def adjust_stock(self, product_id: int, delta: int):
         """
         Change stock by delta (negative to reduce).
         Prevents negative stock.
+        Returns the new stock level, or None if the change was rejected.
         """
-        cur = self.conn.cursor()
-        cur.execute("""
-        UPDATE products
-        SET quantity_in_stock = quantity_in_stock + ?
-        WHERE id = ? AND quantity_in_stock + ? >= 0
-        """, (delta, product_id, delta))
-        self.conn.commit()
+        with self._transaction() as conn:
+            cur = conn.cursor()
+            cur.execute(_SQL_ADJUST_STOCK, (delta, product_id, delta))
+            rows = cur.fetchall()
+        return rows[0][0] if rows else None
 
     def list_inventory(self):
-        """Return all products as list of dicts."""
-        cur = self.conn.cursor()
-        cur.execute("SELECT * FROM products")
-        return [dict(row) for row in cur.fetchall()]
+        """Return all products as a list of sqlite3.Row."""
+        return self._cached_query(_SQL_LIST_INVENTORY)
+
+    def iter_inventory(self):
+        """
+        Yield the product column names, then each product row straight from
+        the cursor, for exports that should not hold the table in memory.
+        """
+        with self._read() as conn:
+            cur = conn.execute(_SQL_LIST_INVENTORY)
+            yield tuple(d[0] for d in cur.description)
+            yield from cur
 
     # Sales operations
     def record_sale(self, items: list, total: float):
         """
         Record a sale transaction and its line items.
-        items: list of dicts with keys product_id, quantity, line_total
+        items: list of (product_id, quantity, line_total) tuples
         """
-        cur = self.conn.cursor()
         ts = datetime.now().isoformat(timespec='seconds')
-        cur.execute("INSERT INTO sales (timestamp, total) VALUES (?, ?)", (ts, total))
-        sale_id = cur.lastrowid
-        for it in items:
-            cur.execute("""
-            INSERT INTO sale_items (sale_id, product_id, quantity, line_total)
-            VALUES (?, ?, ?, ?)
-            """, (sale_id, it['product_id'], it['quantity'], it['line_total']))
-            # reduce inventory
-            self.adjust_stock(it['product_id'], -it['quantity'])
-        self.conn.commit()
-
-    def list_sales(self, date_from: str = None, date_to: str = None):
-        """List sales within optional date range."""
-        cur = self.conn.cursor()
-        q = "SELECT * FROM sales"
-        params = []
-        if date_from and date_to:
-            q += " WHERE timestamp BETWEEN ? AND ?"
-            params = [date_from, date_to]
-        elif date_from:
-            q += " WHERE timestamp >= ?"
-            params = [date_from]
-        elif date_to:
-            q += " WHERE timestamp <= ?"
-            params = [date_to]
-        
-        q += " ORDER BY timestamp DESC"
-        cur.execute(q, params)
-        return [dict(r) for r in cur.fetchall()]
+        # The whole sale, header and lines, commits or rolls back together
+        with self._transaction() as conn:
+            cur = conn.cursor()
+            cur.execute(_SQL_INSERT_SALE, (ts, total))
+            sale_id = cur.lastrowid
+            # trg_sale_items_stock reduces inventory for each line
+            cur.executemany(_SQL_INSERT_SALE_ITEM,
+                            [(sale_id, *it) for it in items])
+
+    def list_sales(self, date_from: str = None, date_to: str = None, item_counts: bool = False):
+        """
+        List sales within optional date range, as sqlite3.Row.
+        With item_counts=True each row also carries the units sold as item_count.
+        """
+        key, params = _date_params(date_from, date_to)
+        sql = (_SQL_LIST_SALES_COUNTED_BY_FILTER if item_counts else _SQL_LIST_SALES_BY_FILTER)[key]
+        with self._read() as conn:
+            cur = conn.cursor()
+            cur.execute(sql, params)
+            return cur.fetchall()
+
+    def get_sales_summary(self, date_from: str = None, date_to: str = None):
+        """
+        Aggregate sales within optional date range into a dict with total,
+        count, avg, first_ts and last_ts (the earliest and latest sale
+        timestamps, None without sales) and best_item (the product name with
+        most units sold).
+        """
+        key, params = _date_params(date_from, date_to)
+        with self._read() as conn:
+            cur = conn.cursor()
+            summary = dict(cur.execute(_SQL_SALES_SUMMARY_BY_FILTER[key], params).fetchone())
+            best = cur.execute(_SQL_BEST_SELLER_BY_FILTER[key], params).fetchone()
+            summary['best_item'] = best['name'] if best else None
+            return summary
     
+    def list_sale_lines(self, date_from: str = None, date_to: str = None):
+        """
+        List every sold line within optional date range, newest sale first,
+        with its sale_id, timestamp, product_name, quantity and line_total.
+        """
+        key, params = _date_params(date_from, date_to)
+        with self._read() as conn:
+            return conn.execute(_SQL_SALE_LINES_BY_FILTER[key], params).fetchall()
+
+    def list_product_sales(self, date_from: str = None, date_to: str = None):
+        """
+        Units sold and revenue per product within optional date range, as
+        sqlite3.Row with product_name, quantity and total.
+        """
+        key, params = _date_params(date_from, date_to)
+        with self._read() as conn:
+            return conn.execute(_SQL_PRODUCT_SALES_BY_FILTER[key], params).fetchall()
+
     def get_sale_details(self, sale_id: int):
         """Get detailed information about a specific sale."""
-        cur = self.conn.cursor()
-        # Get sale header
-        cur.execute("SELECT * FROM sales WHERE id = ?", (sale_id,))
-        sale = cur.fetchone()
-        if not sale:
-            return None
-        
-        # Get sale items with product details
-        cur.execute("""
-        SELECT si.*, p.name, p.barcode, p.price
-        FROM sale_items si
-        JOIN products p ON si.product_id = p.id
-        WHERE si.sale_id = ?
-        """, (sale_id,))
-        
-        items = [dict(row) for row in cur.fetchall()]
+        with self._read() as conn:
+            cur = conn.cursor()
+            # Get sale header
+            cur.execute(_SQL_GET_SALE, (sale_id,))
+            sale = cur.fetchone()
+            if not sale:
+                return None
+            
+            # Get sale items with product details
+            cur.execute(_SQL_GET_SALE_ITEMS, (sale_id,))
+            
+            items = _dictify(cur)
         
         # Return combined data
         return {
             'sale': dict(sale),
             'items': items
         }
+
+    def get_sale_items(self, sale_id: int):
+        """Get the line items of a sale with product details, as dicts."""
+        with self._read() as conn:
+            return _dictify(conn.execute(_SQL_GET_SALE_ITEMS, (sale_id,)))
     
     def get_low_stock_products(self, threshold: int = 10):
-        """Get products with stock below the specified threshold."""
-        cur = self.conn.cursor()
-        cur.execute("""
-        SELECT * FROM products 
-        WHERE quantity_in_stock <= ? 
-        ORDER BY quantity_in_stock ASC
-        """, (threshold,))
-        return [dict(row) for row in cur.fetchall()]
+        """Get products with stock below the specified threshold, as sqlite3.Row."""
+        return self._cached_query(_SQL_LOW_STOCK, (threshold,))
+    
+    def get_inventory_summary(self):
+        """Aggregate the products table into a dict with total_items and total_value."""
+        return dict(self._cached_query(_SQL_INVENTORY_SUMMARY)[0])
     
     def get_sales_by_date_range(self, date_from: str = None, date_to: str = None):
         """Get aggregated sales data by date range."""
-        cur = self.conn.cursor()
-        q = """
-        SELECT 
-            date(timestamp) as sale_date,
-            COUNT(*) as num_transactions,
-            SUM(total) as total_sales
-        FROM sales
-        """
-        
-        params = []
-        if date_from and date_to:
-            q += " WHERE timestamp BETWEEN ? AND ?"
-            params = [date_from, date_to]
-        elif date_from:
-            q += " WHERE timestamp >= ?"
-            params = [date_from]
-        elif date_to:
-            q += " WHERE timestamp <= ?"
-            params = [date_to]
-        
-        q += " GROUP BY date(timestamp) ORDER BY date(timestamp) DESC"
-        
-        cur.execute(q, params)
-        return [dict(row) for row in cur.fetchall()]
+        key, params = _date_params(date_from, date_to)
+        with self._read() as conn:
+            cur = conn.cursor()
+            cur.execute(_SQL_SALES_BY_DATE_BY_FILTER[key], params)
+            return _dictify(cur)
@@ -21,48 +21,74 @@ LOG_LEVELS = {
     "CRITICAL": logging.CRITICAL
 }
 
+# Handlers keyed on the settings they were built from, so reconfiguring
+# with unchanged settings keeps the existing handler and its open file
+_handler_cache = {}
+
+_formatter = logging.Formatter(
+    '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+
+class _LazyRotatingFileHandler(RotatingFileHandler):
+    """Rotating file handler that creates its directory and file on first write."""
+    def _open(self):
+        os.makedirs(os.path.dirname(self.baseFilename), exist_ok=True)
+        return super()._open()
+
+def _get_handlers(log_config):
+    """Return the (key, handler) pairs for a logging config, reusing cached ones."""
+    keys = [
+        ("console",),
+        ("file", log_config["file"], log_config["max_size"], log_config["backup_count"]),
+    ]
+    handlers = []
+    for key in keys:
+        handler = _handler_cache.get(key)
+        if handler is None:
+            if key[0] == "console":
+                handler = logging.StreamHandler()
+            else:
+                # delay=True defers opening the file until the first record
+                handler = _LazyRotatingFileHandler(
+                    log_config["file"],
+                    maxBytes=log_config["max_size"],
+                    backupCount=log_config["backup_count"],
+                    delay=True
+                )
+            handler.setFormatter(_formatter)
+            _handler_cache[key] = handler
+        handlers.append((key, handler))
+    return handlers
+
 def setup_logger(config=None):
     """Set up and configure the application logger."""
     if config is None:
         config = {}
-    
+
     # Merge with default config
     log_config = {**DEFAULT_CONFIG, **config.get("logging", {})}
-    
-    # Create logger
-    logger = logging.getLogger('pos_system')
-    
+
+    # Create logger; module loggers such as POS_System.UI propagate to it
+    logger = logging.getLogger('POS_System')
+
     # Set level
     level = LOG_LEVELS.get(log_config["level"], logging.INFO)
     logger.setLevel(level)
-    
-    # Create formatter
-    formatter = logging.Formatter(
-        '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-    )
-    
-    # Create console handler
-    console_handler = logging.StreamHandler()
-    console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
-    
-    # Create file handler
-    try:
-        # Ensure log directory exists
-        log_dir = os.path.dirname(log_config["file"])
-        if log_dir and not os.path.exists(log_dir):
-            os.makedirs(log_dir, exist_ok=True)
-            
-        file_handler = RotatingFileHandler(
-            log_config["file"],
-            maxBytes=log_config["max_size"],
-            backupCount=log_config["backup_count"]
-        )
-        file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
-    except Exception as e:
-        logger.error(f"Failed to set up file logging: {str(e)}")
-    
+
+    wanted = _get_handlers(log_config)
+    wanted_handlers = [handler for _, handler in wanted]
+
+    # Detach handlers built for different settings and release their files
+    for key, handler in list(_handler_cache.items()):
+        if handler not in wanted_handlers:
+            logger.removeHandler(handler)
+            handler.close()
+            del _handler_cache[key]
+
+    for handler in wanted_handlers:
+        if handler not in logger.handlers:
+            logger.addHandler(handler)
+
     return logger
 
 # Global logger instance
@@ -71,12 +97,8 @@ logger = setup_logger()
 def configure_logger(config):
     """Reconfigure the logger with new settings."""
     global logger
-    
-    # Remove existing handlers
-    for handler in logger.handlers[:]:  # Make a copy of the list
-        logger.removeHandler(handler)
-    
-    # Set up with new config
+
+    # Handlers whose settings are unchanged stay attached
     logger = setup_logger(config)
-    
-    return logger
\ No newline at end of file
+
+    return logger
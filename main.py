@@ -2,22 +2,18 @@
 import os
 import sys
 import logging
-import argparse
 import json
-from pathlib import Path
+from types import SimpleNamespace
 from database import Database
+from logger import logger, configure_logger
 from ui import CashierUI
 
-# Setup logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler("pos_system.log"),
-        logging.StreamHandler()
-    ]
-)
-logger = logging.getLogger("POS_System")
+# orjson parses noticeably faster; fall back to the stdlib when it is missing
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
 
 # Default configuration
 DEFAULT_CONFIG = {
@@ -27,14 +23,29 @@ DEFAULT_CONFIG = {
     "theme": "default"
 }
 
+# Parsed configs keyed by path, stored with the file's mtime at parse time
+_config_cache = {}
+
+# Shared stand-in for a missing config section; only ever read from
+_NO_SECTION = {}
+
 def load_config(config_path="config.json"):
     """Load configuration from JSON file or create default if not exists"""
-    if os.path.exists(config_path):
+    try:
+        mtime = os.stat(config_path).st_mtime_ns
+    except OSError:
+        mtime = None
+    
+    if mtime is not None:
+        cached = _config_cache.get(config_path)
+        if cached and cached[0] == mtime:
+            return cached[1]
         try:
-            with open(config_path, 'r') as f:
-                config = json.load(f)
-                logger.info(f"Configuration loaded from {config_path}")
-                return config
+            with open(config_path, 'rb') as f:
+                config = _json_loads(f.read())
+            logger.info(f"Configuration loaded from {config_path}")
+            _config_cache[config_path] = (mtime, config)
+            return config
         except Exception as e:
             logger.error(f"Error loading config: {e}")
     
@@ -48,23 +59,28 @@ def load_config(config_path="config.json"):
 def setup_directories(config):
     """Create required directories if they don't exist."""
     # Define directory mappings with nested config support
+    get = config.get
     dir_mappings = {
-        'receipt_dir': config.get('receipt', {}).get('receipt_dir', 'receipts'),
-        'export_dir': config.get('export', {}).get('default_dir', 'exports'),
-        'backup_dir': config.get('database', {}).get('backup_dir', 'backups'),
-        'log_dir': os.path.dirname(config.get('logging', {}).get('file', 'logs/pos.log'))
+        'receipt_dir': get('receipt', _NO_SECTION).get('receipt_dir', 'receipts'),
+        'export_dir': get('export', _NO_SECTION).get('default_dir', 'exports'),
+        'backup_dir': get('database', _NO_SECTION).get('backup_dir', 'backups'),
+        'log_dir': os.path.dirname(get('logging', _NO_SECTION).get('file', 'logs/pos.log'))
     }
     
-    for dir_key, dir_path in dir_mappings.items():
-        path = Path(dir_path)
-        if not path.exists():
-            path.mkdir(parents=True, exist_ok=True)
-            logger.info(f"Created directory: {path}")
-        else:
-            logger.debug(f"Directory already exists: {path}")
+    # exist_ok makes a separate existence check redundant; an empty path
+    # means the current directory
+    for dir_path in set(dir_mappings.values()):
+        if dir_path:
+            os.makedirs(dir_path, exist_ok=True)
+            logger.debug(f"Ensured directory exists: {dir_path}")
 
 def parse_arguments():
     """Parse command line arguments"""
+    # Plain launches pass no flags; skip building a parser for them
+    if len(sys.argv) == 1:
+        return SimpleNamespace(config="config.json", debug=False)
+    
+    import argparse
     parser = argparse.ArgumentParser(description="Python POS System")
     parser.add_argument("--config", help="Path to configuration file", default="config.json")
     parser.add_argument("--debug", help="Enable debug mode", action="store_true")
@@ -75,14 +91,17 @@ def main():
         # Parse command line arguments
         args = parse_arguments()
         
+        # Load configuration
+        config = load_config(args.config)
+        
+        # Apply the configured log file, level and rotation
+        configure_logger(config)
+        
         # Set debug level if requested
         if args.debug:
             logger.setLevel(logging.DEBUG)
             logger.debug("Debug mode enabled")
         
-        # Load configuration
-        config = load_config(args.config)
-        
         # Setup required directories
         setup_directories(config)
         
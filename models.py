@@ -1,8 +1,15 @@
 # models.py
+from datetime import datetime
 from database import Database
 
+def _to_cents(amount: float) -> int:
+    """Convert a currency amount to integer cents."""
+    return int(round(amount * 100))
+
 class Product:
     """Represents a product fetched from DB."""
+    __slots__ = ('id', 'barcode', 'name', 'price', 'stock')
+
     def __init__(self, row):
         self.id = row['id']
         self.barcode = row['barcode']
@@ -12,36 +19,76 @@ class Product:
 
 class CartItem:
     """One line in the current cart."""
+    __slots__ = ('product', 'qty')
+
     def __init__(self, product: Product, qty: int):
         self.product = product
         self.qty = qty
 
+    @property
+    def line_total_cents(self):
+        # Rounded from price * qty, as the database's reports compute it, so
+        # sub-cent imported prices do not drift by a cent per unit
+        return _to_cents(self.product.price * self.qty)
+
     @property
     def line_total(self):
-        return round(self.product.price * self.qty, 2)
+        return self.line_total_cents / 100
 
 class Cart:
-    """Holds current sale items."""
+    """
+    Holds current sale items, keyed by product id, with a running
+    subtotal kept in integer cents as the sum of the rounded line totals.
+    """
+    __slots__ = ('_items', '_subtotal_cents')
+
     def __init__(self):
-        self.items = []
+        self._items = {}
+        self._subtotal_cents = 0
+
+    @property
+    def items(self):
+        return list(self._items.values())
 
     def add_item(self, product: Product, qty: int):
         # merge if same product
-        for ci in self.items:
-            if ci.product.id == product.id:
-                ci.qty += qty
-                return
-        self.items.append(CartItem(product, qty))
+        ci = self._items.get(product.id)
+        if ci:
+            self._subtotal_cents -= ci.line_total_cents
+            ci.qty += qty
+        else:
+            ci = self._items[product.id] = CartItem(product, qty)
+        self._subtotal_cents += ci.line_total_cents
+
+    def get(self, product_id: int):
+        """Return the cart line for a product, or None."""
+        return self._items.get(product_id)
+
+    def set_quantity(self, product_id: int, qty: int):
+        ci = self._items[product_id]
+        self._subtotal_cents -= ci.line_total_cents
+        ci.qty = qty
+        self._subtotal_cents += ci.line_total_cents
 
     def remove_item(self, product_id: int):
-        self.items = [ci for ci in self.items if ci.product.id != product_id]
+        ci = self._items.pop(product_id, None)
+        if ci:
+            self._subtotal_cents -= ci.line_total_cents
 
     def clear(self):
-        self.items = []
+        self._items = {}
+        self._subtotal_cents = 0
+
+    def __len__(self):
+        return len(self._items)
+
+    @property
+    def subtotal_cents(self):
+        return self._subtotal_cents
 
     @property
     def subtotal(self):
-        return round(sum(ci.line_total for ci in self.items), 2)
+        return self._subtotal_cents / 100
 
 class CashierSystem:
     """
@@ -71,13 +118,14 @@ class CashierSystem:
         discount: flat amount
         tax_rate: parameter kept for backward compatibility but not used
         """
-        sub = self.cart.subtotal
-        total = round(sub - discount, 2)
+        sub_cents = self.cart.subtotal_cents
+        total_cents = max(sub_cents - _to_cents(discount), 0)
+        sub = sub_cents / 100
         return {
             'subtotal': sub,
             'taxed': sub,  # No tax applied
             'discount': discount,
-            'total': max(total, 0)
+            'total': total_cents / 100
         }
 
     def checkout(self, discount: float = 0, tax_rate: float = 0):
@@ -87,17 +135,21 @@ class CashierSystem:
         tax_rate: parameter kept for backward compatibility but not used
         """
         calc = self.apply_discount_tax(discount, 0)  # Always use 0 for tax_rate
-        items_data = [{
-            'product_id': ci.product.id,
-            'quantity': ci.qty,
-            'line_total': ci.line_total
-        } for ci in self.cart.items]
+        # Build the DB payload and the receipt lines in one pass
+        items_data = []
+        receipt_items = []
+        for ci in self.cart.items:
+            p = ci.product
+            lt = ci.line_total
+            items_data.append((p.id, ci.qty, lt))
+            receipt_items.append((p.name, ci.qty, p.price, lt))
+        # One transaction: the sale row, an executemany of its lines, and the
+        # stock decrements done by the sale_items trigger
         self.db.record_sale(items_data, calc['total'])
         receipt = {
-            'items': [(ci.product.name, ci.qty, ci.product.price, ci.line_total)
-                      for ci in self.cart.items],
+            'items': receipt_items,
             **calc,
-            'timestamp': __import__('datetime').datetime.now().isoformat()
+            'timestamp': datetime.now().isoformat(timespec='seconds')
         }
         self.cart.clear()
         return receipt
@@ -1,17 +1,255 @@
 # ui.py
 import os
+import csv
+import queue
+import subprocess
+import sys
+import threading
+import time
 import tkinter as tk
 import ttkbootstrap as ttk
 from ttkbootstrap.constants import *
-from tkinter import messagebox, filedialog
+from tkinter import messagebox, filedialog, simpledialog
 import datetime
 import logging
+import re
+from operator import itemgetter
 from database import Database
 from models import CashierSystem, Product
-from utils import export_inventory_csv, import_inventory_csv, generate_txt_receipt, generate_pdf_receipt
+from utils import export_inventory_csv, export_inventory_excel, import_inventory_csv, import_inventory_excel, generate_txt_receipt, generate_pdf_receipt, load_reportlab, pdf_styles, EXPORT_BUFFER_SIZE
 
 logger = logging.getLogger("POS_System.UI")
 
+# Our theme names mapped to ttkbootstrap theme names
+BOOTSTRAP_THEMES = {
+    "dark": "darkly",
+    "light": "cosmo",
+    "default": "cosmo"
+}
+
+# Resolved ttk style names for the button bootstyles used in the window
+BUTTON_STYLES = (
+    "info.TButton",
+    "success.TButton",
+    "success.Outline.TButton",
+    "danger.TButton",
+    "warning.TButton",
+)
+
+PAYMENT_METHODS = ("Cash", "Credit Card", "Debit Card", "Mobile Payment")
+
+# Receipt writer per receipt type; the type is also the file extension
+RECEIPT_GENERATORS = {
+    "txt": generate_txt_receipt,
+    "pdf": generate_pdf_receipt,
+}
+
+# Treeview columns and form labels, fixed for the life of the app
+CART_COLUMNS = ("Product", "Qty", "Price", "Line Total")
+INVENTORY_COLUMNS = ("ID", "Barcode", "Name", "Price", "Stock", "Status")
+SALES_COLUMNS = ("ID", "Date", "Time", "Items", "Total", "Payment Method")
+SEARCH_RESULT_COLUMNS = ("Barcode", "Name", "Price", "Stock")
+PRODUCT_FORM_LABELS = ("Barcode", "Name", "Price ($)", "Quantity", "Reorder Level")
+
+# Delay after the last keystroke before a search runs
+SEARCH_DEBOUNCE_MS = 150
+# Product searches shorter than this match too much to be useful
+SEARCH_MIN_CHARS = 2
+
+# Inventory prices are shown without the currency symbol; bound once so
+# formatting a row is a plain call
+_fmt_price = "{:.2f}".format
+
+# Dates are entered as ISO YYYY-MM-DD; the pattern rejects anything else
+# before the string is parsed
+_DATE_FMT = "%Y-%m-%d"
+_DATE_RE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+
+# How often the Tk thread checks whether a background query has finished
+BACKGROUND_POLL_MS = 50
+
+# How often the status bar shows the row count of a running import
+IMPORT_PROGRESS_MS = 250
+
+# Rows kept inserted in a virtualized Treeview, and how close the view may
+# get to either end of that window before it is re-centred
+VIRTUAL_WINDOW_ROWS = 200
+VIRTUAL_EDGE_ROWS = 20
+
+# Sort key per inventory column heading. Cached rows already hold typed
+# values (int id and stock, float price), so numeric columns compare the
+# stored field directly; names sort case-insensitively. Status is derived
+# from stock so it sorts the same way
+INVENTORY_SORT_KEYS = {
+    "ID": itemgetter("id"),
+    "Barcode": lambda row: row["barcode"] or "",
+    "Name": lambda row: (row["name"] or "").lower(),
+    "Price": itemgetter("price"),
+    "Stock": itemgetter("quantity_in_stock"),
+    "Status": itemgetter("quantity_in_stock"),
+}
+
+
+def _parse_date(text):
+    """Parse a YYYY-MM-DD string into a date, raising ValueError otherwise"""
+    if not _DATE_RE.match(text):
+        raise ValueError(f"Invalid date: {text!r}")
+    return datetime.date.fromisoformat(text)
+
+
+def _open_file(path):
+    """Open a saved file in the desktop's default application, without waiting"""
+    if os.name == 'nt':
+        os.startfile(path)
+    elif sys.platform == 'darwin':
+        subprocess.Popen(['open', path])
+    else:
+        subprocess.Popen(['xdg-open', path])
+
+
+class VirtualTreeview:
+    """
+    Renders only a window of a large row list into a Treeview.
+
+    The full data lives in `rows` as (iid, values) pairs; the Treeview holds
+    at most VIRTUAL_WINDOW_ROWS of them around the current scroll position.
+    The scrollbar is driven in fractions of the full list, and the window is
+    moved whenever the view nears its edge.
+    """
+    def __init__(self, tree, scrollbar):
+        self.tree = tree
+        self.scrollbar = scrollbar
+        self.rows = []
+        self._positions = {}
+        # iid -> values of the rows currently inserted in the Treeview
+        self._rendered = {}
+        self._start = 0
+        self._end = 0
+        self._recenter_id = None
+        tree.configure(yscrollcommand=self._on_tree_scroll)
+        scrollbar.configure(command=self._on_scrollbar)
+
+    def set_rows(self, rows, keep_position=False):
+        """Replace the backing rows and redraw around the top (or current) row"""
+        top = self.top_index() if keep_position else 0
+        self.rows = list(rows)
+        self._positions = {iid: i for i, (iid, _) in enumerate(self.rows)}
+        self._render(top, force=True)
+
+    def update_row(self, iid, values):
+        """Replace one row's values in place, appending the row if it is new"""
+        pos = self._positions.get(iid)
+        if pos is None:
+            pos = len(self.rows)
+            self._positions[iid] = pos
+            self.rows.append((iid, values))
+            # Only insert it when the window already reaches the end and has room
+            if self._end == pos and self._end - self._start < VIRTUAL_WINDOW_ROWS:
+                self.tree.insert("", "end", iid=iid, values=values)
+                self._rendered[iid] = values
+                self._end += 1
+            self._on_tree_scroll(*self.tree.yview())
+            return
+
+        self.rows[pos] = (iid, values)
+        if self._start <= pos < self._end:
+            self.tree.item(iid, values=values)
+            self._rendered[iid] = values
+
+    def remove_row(self, iid):
+        """Drop one row, shifting the rendered window to match"""
+        pos = self._positions.pop(iid, None)
+        if pos is None:
+            return
+        del self.rows[pos]
+        for i in range(pos, len(self.rows)):
+            self._positions[self.rows[i][0]] = i
+
+        if self._start <= pos < self._end:
+            self.tree.delete(iid)
+            del self._rendered[iid]
+            self._end -= 1
+        elif pos < self._start:
+            self._start -= 1
+            self._end -= 1
+        self._on_tree_scroll(*self.tree.yview())
+
+    def top_index(self):
+        """Index into `rows` of the first visible row"""
+        first = float(self.tree.yview()[0])
+        return self._start + int(first * (self._end - self._start))
+
+    def _window(self, top):
+        """Slice of `rows` to insert so that row `top` sits mid-window"""
+        n = len(self.rows)
+        start = max(0, min(top - VIRTUAL_WINDOW_ROWS // 2, n - VIRTUAL_WINDOW_ROWS))
+        return start, min(n, start + VIRTUAL_WINDOW_ROWS)
+
+    def _render(self, top, force=False):
+        top = max(0, min(top, len(self.rows) - 1))
+        start, end = self._window(top)
+
+        if force or (start, end) != (self._start, self._end):
+            # Rows already inserted are kept (with their selection) and only
+            # touched if their values changed; new rows are inserted, rows
+            # that left the window are deleted, and a single children call
+            # puts them all in order.
+            # Call the Tcl commands directly; Treeview.insert re-formats
+            # its keyword options into Tcl arguments on every row. The widget
+            # stays packed: Tk defers both its redraw and its yscrollcommand
+            # to idle time, so a rebuild costs one layout and one scroll update
+            call, widget = self.tree.tk.call, self.tree._w
+            old, new = self._rendered, {}
+            for iid, values in self.rows[start:end]:
+                shown = old.pop(iid, None)
+                if shown is None:
+                    call(widget, "insert", "", "end", "-id", iid, "-values", values)
+                elif shown != values:
+                    call(widget, "item", iid, "-values", values)
+                new[iid] = values
+            if old:
+                self.tree.delete(*old)
+            self.tree.set_children("", *new)
+            self._rendered = new
+            self._start, self._end = start, end
+
+        if end > start:
+            self.tree.yview_moveto((top - start) / (end - start))
+        else:
+            self.scrollbar.set(0, 1)
+
+    def _on_tree_scroll(self, first, last):
+        """Translate the Treeview's window-relative position for the scrollbar"""
+        n = len(self.rows)
+        window = self._end - self._start
+        if not n or not window:
+            self.scrollbar.set(0, 1)
+            return
+        first_row = self._start + float(first) * window
+        last_row = self._start + float(last) * window
+        self.scrollbar.set(first_row / n, last_row / n)
+
+        near_start = self._start > 0 and first_row - self._start < VIRTUAL_EDGE_ROWS
+        near_end = self._end < n and self._end - last_row < VIRTUAL_EDGE_ROWS
+        if ((near_start or near_end) and self._recenter_id is None
+                and self._window(int(first_row)) != (self._start, self._end)):
+            # Defer so the window is not rebuilt from inside Tk's own callback
+            self._recenter_id = self.tree.after_idle(self._recenter, int(first_row))
+
+    def _recenter(self, top):
+        self._recenter_id = None
+        self._render(top)
+
+    def _on_scrollbar(self, *args):
+        """Handle scrollbar drags in terms of the full row list"""
+        if args and args[0] == "moveto":
+            self._render(int(float(args[1]) * len(self.rows)))
+        else:
+            # Unit and page steps scroll within the window; _on_tree_scroll
+            # moves the window when they approach its edge
+            self.tree.yview(*args)
+
+
 class CashierUI:
     def __init__(self, db: Database, config=None):
         self.db = db
@@ -20,13 +258,7 @@ class CashierUI:
         
         # Initialize main window with ttkbootstrap
         theme = self.config.get("theme", "default")
-        # Map our theme names to ttkbootstrap theme names
-        bootstrap_themes = {
-            "dark": "darkly",
-            "light": "cosmo",
-            "default": "cosmo"
-        }
-        bootstrap_theme = bootstrap_themes.get(theme, "cosmo")
+        bootstrap_theme = BOOTSTRAP_THEMES.get(theme, "cosmo")
         
         # Create the ttkbootstrap window with the appropriate theme
         self.root = ttk.Window(themename=bootstrap_theme)
@@ -34,28 +266,81 @@ class CashierUI:
         self.root.geometry("1024x768")
         self.root.minsize(800, 600)
         
+        # Build the button styles up front; widgets created with an existing
+        # ttk style name skip ttkbootstrap's bootstyle parsing
+        style = ttk.Style()
+        for style_name in BUTTON_STYLES:
+            style.configure(style_name)
+        
         # Initialize variables
         self.currency = self.config.get("currency", "$")
+        # Formats an amount with the currency symbol, e.g. $12.50
+        self._money = (self.currency.replace("{", "{{").replace("}", "}}") + "{:.2f}").format
         self.discount_var = tk.DoubleVar(value=0.0)
         self.search_var = tk.StringVar()
         self.search_var.trace("w", self._on_search_change)
         
+        # Pending debounced calls keyed by callback, and the last query each
+        # search ran
+        self._debounce_ids = {}
+        self._last_search = None
+        self._last_inv_search = None
+        
+        # The product search popup is reused for each new set of results
+        self._search_popup = None
+        self._search_tv = None
+        self._search_view = None
+        
+        # Inventory sort as (column, reverse), or None for database order
+        self._inv_sorted_by = None
+        
+        # Inventory is loaded in the background; until it arrives the cache is
+        # empty and row edits trigger a fresh load instead
+        self._inv_cache = {}
+        # Display tuples for the cached rows, formatted once per load or edit
+        # so searches and re-sorts only reorder them
+        self._inv_values = {}
+        self._inventory_ready = False
+        self._inv_load_id = 0
+        
+        # Report files generated this session, keyed by (kind, range, format,
+        # directory); cleared whenever sales or stock change
+        self._report_cache = {}
+        # Sales report aggregates keyed by (start, end), cleared alongside it
+        self._sales_summary_cache = {}
+        # Sale rows shown in the sales report, keyed by sale id (their iid)
+        self._report_sales = {}
+        
+        # Rows written so far by a running CSV import, None when idle
+        self._import_progress = None
+        
+        # Status bar clock: pending tick and the text last shown
+        self._clock_after_id = None
+        self._clock_text = None
+        
+        # Report and About dialogs are built on first use and hidden, not
+        # destroyed
+        self._daily_sales_dialog = None
+        self._inventory_status_dialog = None
+        self._low_stock_dialog = None
+        self._about_dialog = None
+        
+        # Right-click menus are built on first use
+        self.cart_context_menu = None
+        self.inv_context_menu = None
+        
         # Build the GUI
         self._build_gui()
 
     def _set_theme(self, theme_name):
         """Set the application theme using ttkbootstrap"""
-        # Map our theme names to ttkbootstrap theme names
-        bootstrap_themes = {
-            "dark": "darkly",
-            "light": "cosmo",
-            "default": "cosmo"
-        }
         
         # Get the corresponding bootstrap theme
-        bootstrap_theme = bootstrap_themes.get(theme_name, "cosmo")
+        bootstrap_theme = BOOTSTRAP_THEMES.get(theme_name, "cosmo")
         
-        # Change the theme
+        # Change the theme. Treeview rows are items, not widgets, so the
+        # restyle cost does not grow with the catalogue; the virtualized
+        # views keep at most VIRTUAL_WINDOW_ROWS rows to redraw afterwards
         style = ttk.Style()
         style.theme_use(bootstrap_theme)
         
@@ -63,16 +348,20 @@ class CashierUI:
 
     def _build_gui(self):
         """Build the main GUI interface"""
-        # Create main frame with ttkbootstrap styling
-        main_frame = ttk.Frame(self.root)
-        main_frame.pack(expand=True, fill='both', padx=10, pady=10)
-        
         # Create menu bar
         self._create_menu_bar()
         
-        # Create status bar
+        # Create status bar first so the packer reserves its row at the
+        # bottom before the main frame expands into the rest
         self._create_status_bar()
         
+        # Create main frame with ttkbootstrap styling. The window has a fixed
+        # geometry, so the frame takes its size from the space left to it
+        # rather than having every child's request propagate up through it
+        main_frame = ttk.Frame(self.root)
+        main_frame.pack_propagate(False)
+        main_frame.pack(expand=True, fill='both', padx=10, pady=10)
+        
         # Create notebook (tabs) with boosted styling
         self.notebook = ttk.Notebook(main_frame, bootstyle="primary")
         self.notebook.pack(expand=True, fill='both')
@@ -100,7 +389,7 @@ class CashierUI:
         barcode_entry.bind('<Return>', lambda e: self._add_to_cart())
         
         # Scan button with icon (would use an actual icon in production)
-        scan_btn = ttk.Button(scan_frame, text="Scan", command=self._simulate_scan, bootstyle="info")
+        scan_btn = ttk.Button(scan_frame, text="Scan", command=self._simulate_scan, style="info.TButton")
         scan_btn.grid(row=0, column=2, padx=5, pady=5)
         
         # Quantity entry
@@ -110,7 +399,7 @@ class CashierUI:
         qty_entry.grid(row=0, column=4, padx=5, pady=5)
         
         # Add to cart button
-        add_btn = ttk.Button(scan_frame, text="Add to Cart", command=self._add_to_cart, bootstyle="success")
+        add_btn = ttk.Button(scan_frame, text="Add to Cart", command=self._add_to_cart, style="success.TButton")
         add_btn.grid(row=0, column=5, padx=5, pady=5)
         
         # Product search
@@ -130,7 +419,7 @@ class CashierUI:
         cart_scroll.pack(side=tk.RIGHT, fill=tk.Y)
         
         # Create treeview
-        cols = ("Product", "Qty", "Price", "Line Total")
+        cols = CART_COLUMNS
         self.cart_tv = ttk.Treeview(cart_frame, columns=cols, show='headings', height=10, 
                                    yscrollcommand=cart_scroll.set)
         
@@ -147,14 +436,14 @@ class CashierUI:
         cart_scroll.config(command=self.cart_tv.yview)
         
         # Add right-click menu to cart
-        self._add_cart_context_menu()
+        self.cart_tv.bind("<Button-3>", self._show_cart_context_menu)
         
         # Cart buttons
         cart_btn_frame = ttk.Frame(self.left_frame)
         cart_btn_frame.pack(fill=tk.X, padx=5, pady=5)
         
-        ttk.Button(cart_btn_frame, text="Remove Selected", command=self._remove_selected, bootstyle="danger").pack(side=tk.LEFT, padx=5)
-        ttk.Button(cart_btn_frame, text="Clear Cart", command=self._clear_cart, bootstyle="warning").pack(side=tk.LEFT, padx=5)
+        ttk.Button(cart_btn_frame, text="Remove Selected", command=self._remove_selected, style="danger.TButton").pack(side=tk.LEFT, padx=5)
+        ttk.Button(cart_btn_frame, text="Clear Cart", command=self._clear_cart, style="warning.TButton").pack(side=tk.LEFT, padx=5)
         
         # Right section - Checkout panel
         checkout_frame = ttk.LabelFrame(self.right_frame, text="Checkout", bootstyle="primary")
@@ -162,7 +451,7 @@ class CashierUI:
         
         # Subtotal display
         ttk.Label(checkout_frame, text="Subtotal:").grid(row=0, column=0, padx=5, pady=10, sticky=tk.W)
-        self.subtotal_var = tk.StringVar(value=f"{self.currency}0.00")
+        self.subtotal_var = tk.StringVar(value=self._money(0))
         ttk.Label(checkout_frame, textvariable=self.subtotal_var, font=("Arial", 12)).grid(row=0, column=1, padx=5, pady=10, sticky=tk.E)
         
         # Discount entry
@@ -171,23 +460,23 @@ class CashierUI:
         discount_entry.grid(row=1, column=1, padx=5, pady=5, sticky=tk.E)
         
         # Calculate button
-        ttk.Button(checkout_frame, text="Calculate Total", command=self._calculate_total, bootstyle="success").grid(row=2, column=0, columnspan=2, padx=5, pady=10)
+        ttk.Button(checkout_frame, text="Calculate Total", command=self._calculate_total, style="success.TButton").grid(row=2, column=0, columnspan=2, padx=5, pady=10)
         
         # Total display
         ttk.Separator(checkout_frame, orient=tk.HORIZONTAL).grid(row=3, column=0, columnspan=2, sticky=tk.EW, padx=5, pady=5)
         ttk.Label(checkout_frame, text="TOTAL:", font=("Arial", 12, "bold")).grid(row=4, column=0, padx=5, pady=10, sticky=tk.W)
-        self.total_var = tk.StringVar(value=f"{self.currency}0.00")
+        self.total_var = tk.StringVar(value=self._money(0))
         ttk.Label(checkout_frame, textvariable=self.total_var, font=("Arial", 14, "bold")).grid(row=4, column=1, padx=5, pady=10, sticky=tk.E)
         
         # Payment method
         ttk.Label(checkout_frame, text="Payment Method:").grid(row=5, column=0, padx=5, pady=5, sticky=tk.W)
-        self.payment_var = tk.StringVar(value="Cash")
+        self.payment_var = tk.StringVar(value=PAYMENT_METHODS[0])
         payment_combo = ttk.Combobox(checkout_frame, textvariable=self.payment_var, state="readonly")
-        payment_combo["values"] = ("Cash", "Credit Card", "Debit Card", "Mobile Payment")
+        payment_combo["values"] = PAYMENT_METHODS
         payment_combo.grid(row=5, column=1, padx=5, pady=5, sticky=tk.E)
         
         # Checkout button
-        checkout_btn = ttk.Button(checkout_frame, text="CHECKOUT", command=self._checkout, bootstyle="success-outline")
+        checkout_btn = ttk.Button(checkout_frame, text="CHECKOUT", command=self._checkout, style="success.Outline.TButton")
         checkout_btn.grid(row=6, column=0, columnspan=2, padx=5, pady=20, sticky=tk.EW)
         
         # Receipt options
@@ -231,9 +520,8 @@ class CashierUI:
         inv_x_scroll.pack(side=tk.BOTTOM, fill=tk.X)
         
         # Create treeview
-        cols2 = ("ID", "Barcode", "Name", "Price", "Stock", "Status")
+        cols2 = INVENTORY_COLUMNS
         self.inv_tv = ttk.Treeview(inv_tree_frame, columns=cols2, show='headings', height=15,
-                                  yscrollcommand=inv_y_scroll.set,
                                   xscrollcommand=inv_x_scroll.set)
         
         # Configure columns
@@ -245,14 +533,17 @@ class CashierUI:
         self.inv_tv.column("Status", width=100, anchor=tk.CENTER)
         
         for c in cols2:
-            self.inv_tv.heading(c, text=c, command=lambda _c=c: self._treeview_sort_column(self.inv_tv, _c, False))
+            self.inv_tv.heading(c, text=c, command=lambda _c=c: self._sort_inventory(_c))
         
         self.inv_tv.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        inv_y_scroll.config(command=self.inv_tv.yview)
+        
+        # Only a window of the inventory is inserted into the Treeview; the
+        # view wires up the vertical scrollbar
+        self.inv_view = VirtualTreeview(self.inv_tv, inv_y_scroll)
         inv_x_scroll.config(command=self.inv_tv.xview)
         
         # Add right-click menu to inventory
-        self._add_inventory_context_menu()
+        self.inv_tv.bind("<Button-3>", self._show_inv_context_menu)
         
         # Bind double-click to edit
         self.inv_tv.bind("<Double-1>", self._on_inventory_double_click)
@@ -264,7 +555,7 @@ class CashierUI:
         ttk.Button(inv_btn_frame, text="Add New Product", command=self._show_add_product).pack(side=tk.LEFT, padx=5)
         ttk.Button(inv_btn_frame, text="Edit Selected", command=self._edit_selected_product).pack(side=tk.LEFT, padx=5)
         ttk.Button(inv_btn_frame, text="Delete Selected", command=self._delete_selected_product).pack(side=tk.LEFT, padx=5)
-        ttk.Button(inv_btn_frame, text="Refresh", command=self._refresh_inventory).pack(side=tk.LEFT, padx=5)
+        ttk.Button(inv_btn_frame, text="Force Refresh", command=self._refresh_inventory).pack(side=tk.LEFT, padx=5)
         
         # Import / Export frame
         imp_exp_frame = ttk.LabelFrame(inv_left_frame, text="Import / Export", bootstyle="primary")
@@ -280,7 +571,7 @@ class CashierUI:
         form_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
         
         # Form fields
-        labels = ["Barcode", "Name", "Price ($)", "Quantity", "Reorder Level"]
+        labels = PRODUCT_FORM_LABELS
         self.inv_vars = [tk.StringVar(), tk.StringVar(), tk.DoubleVar(), tk.IntVar(), tk.IntVar(value=10)]
         
         for i, txt in enumerate(labels):
@@ -294,8 +585,8 @@ class CashierUI:
         ttk.Button(form_btn_frame, text="Save", command=self._save_product).pack(side=tk.LEFT, padx=5)
         ttk.Button(form_btn_frame, text="Clear", command=self._clear_form).pack(side=tk.LEFT, padx=5)
         
-        # Initialize inventory
-        self._refresh_inventory()
+        # Load inventory once the window is up
+        self.root.after_idle(self._refresh_inventory)
         
         # --- Tab 3: Sales Reports ---
         frame3 = ttk.Frame(self.notebook, bootstyle="light")
@@ -326,9 +617,8 @@ class CashierUI:
         report_y_scroll.pack(side=tk.RIGHT, fill=tk.Y)
         
         # Create treeview for sales
-        sales_cols = ("ID", "Date", "Time", "Items", "Total", "Payment Method")
-        self.sales_tv = ttk.Treeview(report_frame, columns=sales_cols, show='headings', height=10,
-                                    yscrollcommand=report_y_scroll.set)
+        sales_cols = SALES_COLUMNS
+        self.sales_tv = ttk.Treeview(report_frame, columns=sales_cols, show='headings', height=10)
         
         # Configure columns
         self.sales_tv.column("ID", width=50, anchor=tk.CENTER)
@@ -342,7 +632,10 @@ class CashierUI:
             self.sales_tv.heading(c, text=c)
         
         self.sales_tv.pack(fill=tk.BOTH, expand=True)
-        report_y_scroll.config(command=self.sales_tv.yview)
+        
+        # Long date ranges can hold many thousands of sales; only a window of
+        # them is inserted, and the view wires up the vertical scrollbar
+        self.sales_view = VirtualTreeview(self.sales_tv, report_y_scroll)
         
         # Bind double-click to view sale details
         self.sales_tv.bind("<Double-1>", self._view_sale_details)
@@ -353,7 +646,7 @@ class CashierUI:
         
         # Summary statistics
         ttk.Label(summary_frame, text="Total Sales:").grid(row=0, column=0, padx=5, pady=5, sticky=tk.W)
-        self.total_sales_var = tk.StringVar(value=f"{self.currency}0.00")
+        self.total_sales_var = tk.StringVar(value=self._money(0))
         ttk.Label(summary_frame, textvariable=self.total_sales_var, font=("Arial", 10, "bold")).grid(row=0, column=1, padx=5, pady=5, sticky=tk.W)
         
         ttk.Label(summary_frame, text="Number of Transactions:").grid(row=0, column=2, padx=5, pady=5, sticky=tk.W)
@@ -361,7 +654,7 @@ class CashierUI:
         ttk.Label(summary_frame, textvariable=self.num_trans_var, font=("Arial", 10, "bold")).grid(row=0, column=3, padx=5, pady=5, sticky=tk.W)
         
         ttk.Label(summary_frame, text="Average Sale:").grid(row=1, column=0, padx=5, pady=5, sticky=tk.W)
-        self.avg_sale_var = tk.StringVar(value=f"{self.currency}0.00")
+        self.avg_sale_var = tk.StringVar(value=self._money(0))
         ttk.Label(summary_frame, textvariable=self.avg_sale_var, font=("Arial", 10, "bold")).grid(row=1, column=1, padx=5, pady=5, sticky=tk.W)
         
         ttk.Label(summary_frame, text="Best Selling Item:").grid(row=1, column=2, padx=5, pady=5, sticky=tk.W)
@@ -369,10 +662,7 @@ class CashierUI:
         ttk.Label(summary_frame, textvariable=self.best_item_var, font=("Arial", 10, "bold")).grid(row=1, column=3, padx=5, pady=5, sticky=tk.W)
         
         # Export report button
-        ttk.Button(summary_frame, text="Export Report", bootstyle="success", command=self._export_sales_report).grid(row=2, column=0, columnspan=4, pady=10)
-        
-        # Force update to ensure widgets are displayed
-        self.root.update_idletasks()
+        ttk.Button(summary_frame, text="Export Report", style="success.TButton", command=self._export_sales_report).grid(row=2, column=0, columnspan=4, pady=10)
 
     def _create_menu_bar(self):
         """Create the application menu bar"""
@@ -425,11 +715,62 @@ class CashierUI:
         datetime_label = ttk.Label(self.status_bar, textvariable=self.datetime_var, padding=(5, 2), bootstyle="inverse-secondary")
         datetime_label.pack(side=tk.RIGHT)
         
-        # Start datetime updates
+        # Start datetime updates; they pause while the app is unfocused
         self._update_datetime()
+        self.root.bind("<FocusIn>", self._on_focus_in, add="+")
+        self.root.bind("<FocusOut>", self._on_focus_out, add="+")
+        
+    def _invalidate_reports(self):
+        """Forget generated report files and sales summaries after data changes"""
+        # Fresh dicts, so a build still running stores into the old one
+        self._report_cache = {}
+        self._sales_summary_cache = {}
+    
+    def _cached_report(self, key, build, dialog, button, done):
+        """
+        Hand done() the report file already built for `key`, or build it on
+        a worker thread while the dialog shows a busy bar
+        """
+        cache = self._report_cache
+        file_path = cache.get(key)
+        if file_path is not None and os.path.exists(file_path):
+            done(file_path)
+            return
         
+        button.configure(state=tk.DISABLED)
+        bar = ttk.Progressbar(dialog, mode='indeterminate')
+        bar.pack(fill=tk.X, padx=10, pady=(0, 10))
+        bar.start()
+        
+        def finish():
+            bar.destroy()
+            button.configure(state=tk.NORMAL)
+        
+        def built(file_path):
+            finish()
+            cache[key] = file_path
+            done(file_path)
+        
+        self._run_in_background(build, built, lambda error: finish())
+    
+    def _reshow_dialog(self, dialog):
+        """Bring back a hidden dialog; False if it still has to be built"""
+        if dialog is None or not dialog.winfo_exists():
+            return False
+        dialog.deiconify()
+        dialog.lift()
+        dialog.grab_set()
+        return True
+    
+    def _hide_dialog(self, dialog):
+        """Hide a dialog so the next open reuses its widgets"""
+        dialog.grab_release()
+        dialog.withdraw()
+    
     def _show_daily_sales(self):
         """Show daily sales report"""
+        if self._reshow_dialog(self._daily_sales_dialog):
+            return
         try:
             # Create date selection dialog
             date_dialog = tk.Toplevel(self.root)
@@ -438,6 +779,8 @@ class CashierUI:
             date_dialog.resizable(False, False)
             date_dialog.transient(self.root)
             date_dialog.grab_set()
+            date_dialog.protocol("WM_DELETE_WINDOW", lambda: self._hide_dialog(date_dialog))
+            self._daily_sales_dialog = date_dialog
             
             ttk.Label(date_dialog, text="Select date range for sales report:").pack(pady=10)
             
@@ -447,13 +790,13 @@ class CashierUI:
             
             # Start date
             ttk.Label(date_frame, text="Start Date:").grid(row=0, column=0, sticky=tk.W, pady=5)
-            start_date = tk.StringVar(value=datetime.now().strftime("%Y-%m-%d"))
+            start_date = tk.StringVar(value=self._today_str)
             start_entry = ttk.Entry(date_frame, textvariable=start_date)
             start_entry.grid(row=0, column=1, sticky=tk.W, padx=5, pady=5)
             
             # End date
             ttk.Label(date_frame, text="End Date:").grid(row=1, column=0, sticky=tk.W, pady=5)
-            end_date = tk.StringVar(value=datetime.now().strftime("%Y-%m-%d"))
+            end_date = tk.StringVar(value=self._today_str)
             end_entry = ttk.Entry(date_frame, textvariable=end_date)
             end_entry.grid(row=1, column=1, sticky=tk.W, padx=5, pady=5)
             
@@ -477,38 +820,46 @@ class CashierUI:
                     report_format = format_var.get()
                     
                     # Validate dates
-                    datetime.strptime(start, "%Y-%m-%d")
-                    datetime.strptime(end, "%Y-%m-%d")
+                    _parse_date(start)
+                    _parse_date(end)
                     
                     # Generate report based on format
                     export_dir = self.config.get('export', {}).get('default_dir', 'exports')
-                    if report_format == "pdf":
-                        from utils import generate_pdf_report
-                        sales_data = self.db.get_sales_by_date_range(start, end)
-                        file_path = generate_pdf_report(sales_data, "Sales Report", start, end, export_dir)
-                    elif report_format == "excel":
-                        from utils import generate_sales_report
-                        file_path = generate_sales_report(self.db, start, end, "excel", export_dir)
-                    else:  # CSV
-                        from utils import generate_sales_report
-                        file_path = generate_sales_report(self.db, start, end, "csv", export_dir)
+                    def build():
+                        if report_format == "pdf":
+                            from utils import generate_pdf_report
+                            sales_data = self.db.get_sales_by_date_range(start, end)
+                            return generate_pdf_report(sales_data, "Sales Report", start, end, export_dir)
+                        elif report_format == "excel":
+                            from utils import generate_sales_report
+                            return generate_sales_report(self.db, start, end, "excel", export_dir)
+                        else:  # CSV
+                            from utils import generate_sales_report
+                            return generate_sales_report(self.db, start, end, "csv", export_dir)
+                    
+                    def done(file_path):
+                        self._hide_dialog(date_dialog)
+                        messagebox.showinfo("Report Generated", f"Sales report has been generated and saved to:\n{file_path}")
                     
-                    date_dialog.destroy()
-                    messagebox.showinfo("Report Generated", f"Sales report has been generated and saved to:\n{file_path}")
+                    self._cached_report(("sales", start, end, report_format, export_dir), build,
+                                        date_dialog, generate_btn, done)
                     
                 except ValueError as e:
                     messagebox.showerror("Invalid Date", "Please enter dates in YYYY-MM-DD format")
                 except Exception as e:
                     messagebox.showerror("Error", f"Failed to generate report: {str(e)}")
             
-            ttk.Button(btn_frame, text="Generate", command=generate_report).pack(side=tk.LEFT, padx=5)
-            ttk.Button(btn_frame, text="Cancel", command=date_dialog.destroy).pack(side=tk.RIGHT, padx=5)
+            generate_btn = ttk.Button(btn_frame, text="Generate", command=generate_report)
+            generate_btn.pack(side=tk.LEFT, padx=5)
+            ttk.Button(btn_frame, text="Cancel", command=lambda: self._hide_dialog(date_dialog)).pack(side=tk.RIGHT, padx=5)
             
         except Exception as e:
             messagebox.showerror("Error", f"Failed to open sales report dialog: {str(e)}")
     
     def _show_inventory_status(self):
         """Show inventory status report"""
+        if self._reshow_dialog(self._inventory_status_dialog):
+            return
         try:
             # Create format selection dialog
             format_dialog = tk.Toplevel(self.root)
@@ -517,6 +868,8 @@ class CashierUI:
             format_dialog.resizable(False, False)
             format_dialog.transient(self.root)
             format_dialog.grab_set()
+            format_dialog.protocol("WM_DELETE_WINDOW", lambda: self._hide_dialog(format_dialog))
+            self._inventory_status_dialog = format_dialog
             
             ttk.Label(format_dialog, text="Generate inventory status report:").pack(pady=10)
             
@@ -539,28 +892,36 @@ class CashierUI:
                     export_dir = self.config.get('export', {}).get('default_dir', 'exports')
                     
                     # Generate report based on format
-                    if report_format == "pdf":
-                        from utils import generate_pdf_report
-                        inventory_data = self.db.list_inventory()
-                        file_path = generate_pdf_report(inventory_data, "Inventory Status", None, None, export_dir)
-                    else:  # Excel or CSV
-                        from utils import generate_inventory_report
-                        file_path = generate_inventory_report(self.db, report_format, export_dir)
+                    def build():
+                        if report_format == "pdf":
+                            from utils import generate_pdf_report
+                            inventory_data = self.db.list_inventory()
+                            return generate_pdf_report(inventory_data, "Inventory Status", None, None, export_dir)
+                        else:  # Excel or CSV
+                            from utils import generate_inventory_report
+                            return generate_inventory_report(self.db, report_format, export_dir)
+                    
+                    def done(file_path):
+                        self._hide_dialog(format_dialog)
+                        messagebox.showinfo("Report Generated", f"Inventory report has been generated and saved to:\n{file_path}")
                     
-                    format_dialog.destroy()
-                    messagebox.showinfo("Report Generated", f"Inventory report has been generated and saved to:\n{file_path}")
+                    self._cached_report(("inventory", None, None, report_format, export_dir), build,
+                                        format_dialog, generate_btn, done)
                     
                 except Exception as e:
                     messagebox.showerror("Error", f"Failed to generate report: {str(e)}")
             
-            ttk.Button(btn_frame, text="Generate", command=generate_report).pack(side=tk.LEFT, padx=5)
-            ttk.Button(btn_frame, text="Cancel", command=format_dialog.destroy).pack(side=tk.RIGHT, padx=5)
+            generate_btn = ttk.Button(btn_frame, text="Generate", command=generate_report)
+            generate_btn.pack(side=tk.LEFT, padx=5)
+            ttk.Button(btn_frame, text="Cancel", command=lambda: self._hide_dialog(format_dialog)).pack(side=tk.RIGHT, padx=5)
             
         except Exception as e:
             messagebox.showerror("Error", f"Failed to open inventory report dialog: {str(e)}")
     
     def _show_low_stock(self):
         """Show low stock alert report"""
+        if self._reshow_dialog(self._low_stock_dialog):
+            return
         try:
             # Create threshold selection dialog
             threshold_dialog = tk.Toplevel(self.root)
@@ -569,6 +930,8 @@ class CashierUI:
             threshold_dialog.resizable(False, False)
             threshold_dialog.transient(self.root)
             threshold_dialog.grab_set()
+            threshold_dialog.protocol("WM_DELETE_WINDOW", lambda: self._hide_dialog(threshold_dialog))
+            self._low_stock_dialog = threshold_dialog
             
             ttk.Label(threshold_dialog, text="Generate low stock alert report:").pack(pady=10)
             
@@ -603,40 +966,50 @@ class CashierUI:
                     low_stock_items = self.db.get_low_stock_products(threshold)
                     
                     if not low_stock_items:
-                        threshold_dialog.destroy()
+                        self._hide_dialog(threshold_dialog)
                         messagebox.showinfo("No Low Stock", "There are no items below the specified threshold.")
                         return
                     
                     # Generate report based on format
-                    if report_format == "pdf":
-                        from utils import generate_pdf_report
-                        file_path = generate_pdf_report(low_stock_items, "Low Stock Alert", None, None, export_dir)
-                    else:  # Excel or CSV
-                        from utils import generate_inventory_report
-                        file_path = generate_inventory_report(self.db, report_format, export_dir, low_stock_only=True, threshold=threshold)
+                    def build():
+                        if report_format == "pdf":
+                            from utils import generate_pdf_report
+                            return generate_pdf_report(low_stock_items, "Low Stock Alert", None, None, export_dir)
+                        else:  # Excel or CSV
+                            from utils import generate_inventory_report
+                            return generate_inventory_report(self.db, report_format, export_dir, low_stock_only=True, threshold=threshold)
                     
-                    threshold_dialog.destroy()
-                    messagebox.showinfo("Report Generated", f"Low stock report has been generated and saved to:\n{file_path}")
+                    def done(file_path):
+                        self._hide_dialog(threshold_dialog)
+                        messagebox.showinfo("Report Generated", f"Low stock report has been generated and saved to:\n{file_path}")
+                    
+                    self._cached_report(("low_stock", threshold, None, report_format, export_dir), build,
+                                        threshold_dialog, generate_btn, done)
                     
                 except ValueError:
                     messagebox.showerror("Invalid Threshold", "Please enter a valid number for the threshold")
                 except Exception as e:
                     messagebox.showerror("Error", f"Failed to generate report: {str(e)}")
             
-            ttk.Button(btn_frame, text="Generate", command=generate_report).pack(side=tk.LEFT, padx=5)
-            ttk.Button(btn_frame, text="Cancel", command=threshold_dialog.destroy).pack(side=tk.RIGHT, padx=5)
+            generate_btn = ttk.Button(btn_frame, text="Generate", command=generate_report)
+            generate_btn.pack(side=tk.LEFT, padx=5)
+            ttk.Button(btn_frame, text="Cancel", command=lambda: self._hide_dialog(threshold_dialog)).pack(side=tk.RIGHT, padx=5)
             
         except Exception as e:
             messagebox.showerror("Error", f"Failed to open low stock report dialog: {str(e)}")
     
     def _show_about(self):
         """Show about dialog"""
+        if self._reshow_dialog(self._about_dialog):
+            return
         about_dialog = tk.Toplevel(self.root)
         about_dialog.title("About")
         about_dialog.geometry("400x300")
         about_dialog.resizable(False, False)
         about_dialog.transient(self.root)
         about_dialog.grab_set()
+        about_dialog.protocol("WM_DELETE_WINDOW", lambda: self._hide_dialog(about_dialog))
+        self._about_dialog = about_dialog
         
         # App info
         app_name = self.config.get('app_name', 'Advanced POS System')
@@ -660,7 +1033,8 @@ class CashierUI:
         ttk.Label(content_frame, text="© 2025 All Rights Reserved", justify=tk.CENTER).pack()
         
         # Close button
-        ttk.Button(content_frame, text="Close", command=about_dialog.destroy).pack(pady=20)
+        ttk.Button(content_frame, text="Close",
+                   command=lambda: self._hide_dialog(about_dialog)).pack(pady=20)
         
     def _change_theme(self, theme_name):
         """Change the application theme"""
@@ -682,36 +1056,87 @@ class CashierUI:
     
     def _update_datetime(self):
         """Update the datetime display in status bar"""
-        now = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        self.datetime_var.set(now)
-        self.root.after(1000, self._update_datetime)
+        now = time.strftime(_DATE_FMT + " %H:%M:%S")
+        if now != self._clock_text:
+            self._clock_text = now
+            self.datetime_var.set(now)
+            # Date dialogs default to today; reuse the date part of the clock
+            self._today_str = now[:10]
+        # Wake just after the next wall-clock second rather than drifting
+        # a little later on every tick
+        delay = 1000 - int(time.time() * 1000) % 1000
+        self._clock_after_id = self.root.after(delay, self._update_datetime)
+    
+    def _on_focus_in(self, event):
+        """Restart the clock when the app regains focus"""
+        if self._clock_after_id is None:
+            self._update_datetime()
+    
+    def _on_focus_out(self, event):
+        # Focus moving between our own widgets also sends FocusOut, so only
+        # check once it has settled
+        self.root.after_idle(self._pause_clock_if_unfocused)
+    
+    def _pause_clock_if_unfocused(self):
+        # Tk's focus command returns "" when no window of this app has focus
+        if self._clock_after_id is not None and not self.root.tk.call("focus"):
+            self.root.after_cancel(self._clock_after_id)
+            self._clock_after_id = None
     
     def _update_status(self, message):
         """Update status bar message"""
         self.status_var.set(message)
         logger.info(message)
 
+    def _debounce(self, ms, fn):
+        """Run fn once, ms after the last of a burst of calls for it"""
+        pending = self._debounce_ids.get(fn)
+        if pending:
+            self.root.after_cancel(pending)
+        
+        def run():
+            del self._debounce_ids[fn]
+            fn()
+        
+        self._debounce_ids[fn] = self.root.after(ms, run)
+    
     def _on_inventory_search(self, *args):
+        """Schedule the inventory filter to run once typing pauses"""
+        self._debounce(SEARCH_DEBOUNCE_MS, self._do_inventory_search)
+    
+    def _do_inventory_search(self):
         """Filter inventory items based on search input"""
-        search_term = self.inv_search_var.get().lower()
-        # Clear the treeview
-        for item in self.inv_tv.get_children():
-            self.inv_tv.delete(item)
-            
-        # Repopulate with filtered items
-        for product in self.inventory:
-            # Check if search term is in product name, barcode, or category
-            if (search_term in product.name.lower() or 
-                search_term in str(product.barcode).lower() or 
-                search_term in product.category.lower()):
-                self.inv_tv.insert("", tk.END, values=(
-                    product.id,
-                    product.barcode,
-                    product.name,
-                    product.category,
-                    f"${product.price:.2f}",
-                    product.stock
-                ))
+        search_term = self.inv_search_var.get().strip()
+        if search_term == self._last_inv_search:
+            return
+        self._last_inv_search = search_term
+        
+        self._show_inventory()
+    
+    def _show_inventory(self, keep_position=False):
+        """Render the cached products that match the current inventory search"""
+        term = self._last_inv_search
+        cache = self._inv_cache
+        if term:
+            # Prefix lookup through the name and barcode indexes; only when
+            # nothing starts with the term fall back to a substring scan. The
+            # rows shown still come from the cache
+            hits = self.db.search_products(term) or self.db.search_products(term, substring=True)
+            rows = [cache[r['id']] for r in hits if r['id'] in cache]
+        else:
+            rows = list(cache.values())
+        if self._inv_sorted_by:
+            col, reverse = self._inv_sorted_by
+            rows.sort(key=INVENTORY_SORT_KEYS[col], reverse=reverse)
+        values = self._inv_values
+        self.inv_view.set_rows([(row['id'], values[row['id']]) for row in rows],
+                               keep_position=keep_position)
+    
+    def _sort_inventory(self, col):
+        """Sort the inventory by a column, reversing on a repeated click"""
+        reverse = self._inv_sorted_by == (col, False)
+        self._inv_sorted_by = (col, reverse)
+        self._show_inventory()
     
     def _edit_selected_product(self):
         """Edit the selected product in inventory"""
@@ -723,30 +1148,25 @@ class CashierUI:
         # Get the product ID from the selected item
         item_id = self.inv_tv.item(selected[0], 'values')[0]
         
-        # Find the product in inventory
-        product = None
-        for p in self.inventory:
-            if p.id == int(item_id):
-                product = p
-                break
+        # Look the product up in the inventory cache
+        product = self._inv_cache.get(int(item_id))
                 
         if not product:
             messagebox.showerror("Error", "Product not found")
             return
             
-        # Populate the form with product details
-        self.product_id_var.set(product.id)
-        self.barcode_var.set(product.barcode)
-        self.name_var.set(product.name)
-        self.category_var.set(product.category)
-        self.price_var.set(f"{product.price:.2f}")
-        self.stock_var.set(product.stock)
+        # Populate the form with product details; saving matches on barcode
+        barcode_var, name_var, price_var, qty_var = self.inv_vars[:4]
+        barcode_var.set(product['barcode'])
+        name_var.set(product['name'])
+        price_var.set(product['price'])
+        qty_var.set(product['quantity_in_stock'])
         
         # Switch to inventory tab if not already there
         self.notebook.select(1)
         
         # Update status
-        self._update_status(f"Editing product: {product.name}")
+        self._update_status(f"Editing product: {product['name']}")
     
     def _delete_selected_product(self):
         """Delete the selected product from inventory"""
@@ -767,11 +1187,14 @@ class CashierUI:
             # Delete from database
             self.db.delete_product(int(item_id))
             
-            # Refresh inventory
-            self._refresh_inventory()
+            # Drop just this row from the cached inventory
+            self._uncache_inventory_row(int(item_id))
             
             # Update status
             self._update_status(f"Product deleted: {product_name}")
+        except ValueError as e:
+            # Products that have been sold are kept for their sales history
+            messagebox.showwarning("Cannot Delete", str(e))
         except Exception as e:
             messagebox.showerror("Error", f"Failed to delete product: {str(e)}")
     
@@ -860,16 +1283,13 @@ class CashierUI:
         # Update status
         self._update_status("Adding new product")
     
-    def _add_cart_context_menu(self):
-        """Add right-click context menu to cart treeview"""
+    def _build_cart_context_menu(self):
+        """Build the right-click context menu for the cart treeview"""
         self.cart_context_menu = tk.Menu(self.root, tearoff=0)
         self.cart_context_menu.add_command(label="Remove Item", command=self._remove_selected)
         self.cart_context_menu.add_command(label="Edit Quantity", command=self._edit_cart_quantity)
         self.cart_context_menu.add_separator()
         self.cart_context_menu.add_command(label="Clear Cart", command=self._clear_cart)
-        
-        # Bind right-click to show context menu
-        self.cart_tv.bind("<Button-3>", self._show_cart_context_menu)
     
     def _show_cart_context_menu(self, event):
         """Show context menu on right-click"""
@@ -877,18 +1297,17 @@ class CashierUI:
         iid = self.cart_tv.identify_row(event.y)
         if iid:
             self.cart_tv.selection_set(iid)
+            if self.cart_context_menu is None:
+                self._build_cart_context_menu()
             self.cart_context_menu.post(event.x_root, event.y_root)
     
-    def _add_inventory_context_menu(self):
-        """Add right-click context menu to inventory treeview"""
+    def _build_inventory_context_menu(self):
+        """Build the right-click context menu for the inventory treeview"""
         self.inv_context_menu = tk.Menu(self.root, tearoff=0)
         self.inv_context_menu.add_command(label="Edit Product", command=self._edit_selected_product)
         self.inv_context_menu.add_command(label="Delete Product", command=self._delete_selected_product)
         self.inv_context_menu.add_separator()
         self.inv_context_menu.add_command(label="Adjust Stock", command=self._adjust_stock)
-        
-        # Bind right-click to show context menu
-        self.inv_tv.bind("<Button-3>", self._show_inv_context_menu)
     
     def _show_inv_context_menu(self, event):
         """Show inventory context menu on right-click"""
@@ -896,12 +1315,21 @@ class CashierUI:
         iid = self.inv_tv.identify_row(event.y)
         if iid:
             self.inv_tv.selection_set(iid)
+            if self.inv_context_menu is None:
+                self._build_inventory_context_menu()
             self.inv_context_menu.post(event.x_root, event.y_root)
     
     def _on_search_change(self, *args):
+        """Schedule a product search to run once typing pauses"""
+        self._debounce(SEARCH_DEBOUNCE_MS, self._do_search)
+    
+    def _do_search(self):
         """Filter products in cart view based on search term"""
-        search_term = self.search_var.get().lower()
-        if not search_term:
+        search_term = self.search_var.get().strip().lower()
+        if search_term == self._last_search:
+            return
+        self._last_search = search_term
+        if len(search_term) < SEARCH_MIN_CHARS:
             return
         
         try:
@@ -913,46 +1341,57 @@ class CashierUI:
             self._update_status(f"Search error: {str(e)}")
     
     def _show_search_results(self, results):
-        """Display search results in a popup"""
-        popup = tk.Toplevel(self.root)
-        popup.title("Search Results")
-        popup.geometry("400x300")
-        popup.transient(self.root)
-        
-        # Create treeview for results
-        cols = ("Barcode", "Name", "Price", "Stock")
-        tv = ttk.Treeview(popup, columns=cols, show='headings', height=10)
-        
-        for c in cols:
-            tv.heading(c, text=c)
-        
-        # Add scrollbar
-        scrollbar = ttk.Scrollbar(popup, orient="vertical", command=tv.yview)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        tv.configure(yscrollcommand=scrollbar.set)
-        tv.pack(expand=True, fill=tk.BOTH, padx=5, pady=5)
+        """Display search results in a popup, reusing it if already open"""
+        popup = self._search_popup
+        if popup is None:
+            popup = self._search_popup = tk.Toplevel(self.root)
+            popup.title("Search Results")
+            popup.geometry("400x300")
+            popup.transient(self.root)
+            popup.protocol("WM_DELETE_WINDOW", self._close_search_popup)
+            
+            # Create treeview for results
+            cols = SEARCH_RESULT_COLUMNS
+            tv = self._search_tv = ttk.Treeview(popup, columns=cols, show='headings', height=10)
+            
+            for c in cols:
+                tv.heading(c, text=c)
+            
+            # Add scrollbar; rows are windowed like the inventory, and rows
+            # that appear in consecutive result sets are kept, not recreated
+            scrollbar = ttk.Scrollbar(popup, orient="vertical")
+            scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+            tv.pack(expand=True, fill=tk.BOTH, padx=5, pady=5)
+            self._search_view = VirtualTreeview(tv, scrollbar)
+            
+            # Bind double-click to select product
+            tv.bind("<Double-1>", lambda e: self._select_search_result())
+            
+            # Add button frame
+            btn_frame = ttk.Frame(popup)
+            btn_frame.pack(fill=tk.X, padx=5, pady=5)
+            
+            ttk.Button(btn_frame, text="Select", 
+                      command=self._select_search_result).pack(side=tk.LEFT, padx=5)
+            ttk.Button(btn_frame, text="Cancel", 
+                      command=self._close_search_popup).pack(side=tk.RIGHT, padx=5)
+        else:
+            popup.lift()
         
         # Add results to treeview
-        for row in results:
-            tv.insert("", "end", iid=row['id'], values=(
-                row['barcode'], row['name'], f"${row['price']:.2f}", row['quantity_in_stock']
-            ))
-        
-        # Bind double-click to select product
-        tv.bind("<Double-1>", lambda e: self._select_search_result(tv, popup))
-        
-        # Add button frame
-        btn_frame = ttk.Frame(popup)
-        btn_frame.pack(fill=tk.X, padx=5, pady=5)
-        
-        ttk.Button(btn_frame, text="Select", 
-                  command=lambda: self._select_search_result(tv, popup)).pack(side=tk.LEFT, padx=5)
-        ttk.Button(btn_frame, text="Cancel", 
-                  command=popup.destroy).pack(side=tk.RIGHT, padx=5)
+        money = self._money
+        self._search_view.set_rows([(row['id'], (
+            row['barcode'], row['name'], money(row['price']), row['quantity_in_stock']
+        )) for row in results])
+    
+    def _close_search_popup(self):
+        if self._search_popup is not None:
+            self._search_popup.destroy()
+            self._search_popup = self._search_tv = self._search_view = None
     
-    def _select_search_result(self, tv, popup):
+    def _select_search_result(self):
         """Handle selection from search results"""
-        selected_id = tv.selection()
+        selected_id = self._search_tv.selection()
         if not selected_id:
             return
         
@@ -960,7 +1399,7 @@ class CashierUI:
         row = self.db.get_product_by_id(int(selected_id[0]))
         if row:
             self.barcode_var.set(row['barcode'])
-            popup.destroy()
+            self._close_search_popup()
     
     def _simulate_scan(self):
         """Simulate barcode scanning (in a real app, would use camera/scanner)"""
@@ -989,20 +1428,19 @@ class CashierUI:
             # Add to cart and update UI
             prod, qty = self.sys.scan_and_add(bc, qt)
             
-            # Check if item already in cart (update instead of insert)
-            existing = self.cart_tv.exists(prod.id)
-            if existing:
-                # Update existing item
-                current_values = self.cart_tv.item(prod.id, 'values')
-                new_qty = int(current_values[1]) + qty
-                new_total = prod.price * new_qty
+            # The cart merged the scan into an existing line when its
+            # quantity is more than was just added (update instead of insert)
+            item = self.sys.cart.get(prod.id)
+            if item.qty != qty:
+                # The line keeps the product and price it was first added at
+                money = self._money
                 self.cart_tv.item(prod.id, values=(
-                    prod.name, new_qty, f"${prod.price:.2f}", f"${new_total:.2f}"
+                    item.product.name, item.qty, money(item.product.price), money(item.line_total)
                 ))
             else:
                 # Insert new item
                 self.cart_tv.insert("", "end", iid=prod.id, values=(
-                    prod.name, qty, f"${prod.price:.2f}", f"${prod.price*qty:.2f}"
+                    prod.name, qty, self._money(prod.price), self._money(prod.price * qty)
                 ))
             
             # Clear barcode field and reset quantity to 1
@@ -1026,10 +1464,10 @@ class CashierUI:
             messagebox.showinfo("Selection", "Please select an item to remove")
             return
         
-        # Remove from cart model and UI
+        # Remove from cart model by id, then drop all the rows in one call
         for item_id in selected:
             self.sys.cart.remove_item(int(item_id))
-            self.cart_tv.delete(item_id)
+        self.cart_tv.delete(*selected)
         
         # Update totals
         self._update_cart_total()
@@ -1037,7 +1475,7 @@ class CashierUI:
     
     def _clear_cart(self):
         """Clear all items from cart"""
-        if not self.cart_tv.get_children():
+        if not self.sys.cart:
             return
             
         if messagebox.askyesno("Clear Cart", "Are you sure you want to clear the cart?"):
@@ -1053,31 +1491,30 @@ class CashierUI:
             messagebox.showinfo("Selection", "Please select an item to edit")
             return
         
-        # Get current quantity
+        # Cart rows use the product id as their iid; read the quantity from
+        # the cart model rather than parsing it back out of the Treeview
         item_id = selected[0]
-        current_values = self.cart_tv.item(item_id, 'values')
-        current_qty = int(current_values[1])
+        item = self.sys.cart.get(int(item_id))
+        if not item:
+            return
+        current_qty = item.qty
         
         # Show dialog to edit quantity
         new_qty = simpledialog.askinteger("Edit Quantity", "Enter new quantity:", 
                                         initialvalue=current_qty, minvalue=1)
         
         if new_qty is not None:
-            # Update cart model
-            for item in self.sys.cart.items:
-                if item.product.id == int(item_id):
-                    # Check if we have enough stock
-                    if new_qty > item.product.stock + current_qty:
-                        messagebox.showerror("Stock Error", "Not enough stock available")
-                        return
-                    
-                    # Update quantity and UI
-                    item.qty = new_qty
-                    new_total = item.product.price * new_qty
-                    self.cart_tv.item(item_id, values=(
-                        item.product.name, new_qty, f"${item.product.price:.2f}", f"${new_total:.2f}"
-                    ))
-                    break
+            # Check if we have enough stock
+            if new_qty > item.product.stock + current_qty:
+                messagebox.showerror("Stock Error", "Not enough stock available")
+                return
+            
+            # Update quantity and UI
+            self.sys.cart.set_quantity(item.product.id, new_qty)
+            money = self._money
+            self.cart_tv.item(item_id, values=(
+                item.product.name, new_qty, money(item.product.price), money(item.line_total)
+            ))
             
             # Update totals
             self._update_cart_total()
@@ -1086,11 +1523,17 @@ class CashierUI:
     def _update_cart_total(self):
         """Update the cart subtotal display"""
         subtotal = self.sys.cart.subtotal
-        self.subtotal_var.set(f"{self.currency}{subtotal:.2f}")
+        self._set_if_changed(self.subtotal_var, self._money(subtotal))
         
         # Also update the total with current discount and tax
         self._calculate_total()
     
+    @staticmethod
+    def _set_if_changed(var, value):
+        """Write a Tk variable only when its text actually changes"""
+        if var.get() != value:
+            var.set(value)
+    
     def _calculate_total(self):
         """Calculate and display the total with discount"""
         discount = self.discount_var.get()
@@ -1099,11 +1542,11 @@ class CashierUI:
         calc = self.sys.apply_discount_tax(discount, 0)
         
         # Update total display
-        self.total_var.set(f"{self.currency}{calc['total']:.2f}")
+        self._set_if_changed(self.total_var, self._money(calc['total']))
     
     def _checkout(self):
         """Process checkout with current cart items"""
-        if not self.cart_tv.get_children():
+        if not self.sys.cart:
             messagebox.showinfo("Checkout", "Cart is empty")
             return
         
@@ -1112,6 +1555,9 @@ class CashierUI:
         payment_method = self.payment_var.get()
         
         try:
+            # Remember what leaves stock; checkout empties the cart
+            sold = [(item.product.id, item.qty) for item in self.sys.cart.items]
+            
             # Process checkout (with tax_rate=0)
             receipt = self.sys.checkout(discount=discount, tax_rate=0)
             
@@ -1125,12 +1571,10 @@ class CashierUI:
             
             timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
             
-            if receipt_type == "pdf":
-                receipt_path = os.path.join(receipt_dir, f"receipt_{timestamp}.pdf")
-                generate_pdf_receipt(receipt, receipt_path, currency=self.currency)
-            else:  # Default to txt
-                receipt_path = os.path.join(receipt_dir, f"receipt_{timestamp}.txt")
-                generate_txt_receipt(receipt, receipt_path, currency=self.currency)
+            # Unknown types fall back to a text receipt
+            receipt_type = receipt_type if receipt_type in RECEIPT_GENERATORS else "txt"
+            receipt_path = os.path.join(receipt_dir, f"receipt_{timestamp}.{receipt_type}")
+            RECEIPT_GENERATORS[receipt_type](receipt, receipt_path, currency=self.currency)
             
             # Show success message
             messagebox.showinfo("Checkout Complete", 
@@ -1139,11 +1583,19 @@ class CashierUI:
             # Clear cart and reset fields
             self.cart_tv.delete(*self.cart_tv.get_children())
             self.discount_var.set(0.0)
-            self.subtotal_var.set("$0.00")
-            self.total_var.set("$0.00")
+            self._set_if_changed(self.subtotal_var, self._money(0))
+            self._set_if_changed(self.total_var, self._money(0))
             
-            # Refresh inventory display
-            self._refresh_inventory()
+            # Reports generated so far no longer include this sale
+            self._invalidate_reports()
+            
+            # Update stock on the sold rows only
+            for pid, qty in sold:
+                row = self._inv_cache.get(pid)
+                if row is not None:
+                    row = dict(row)
+                    row['quantity_in_stock'] -= qty
+                    self._cache_inventory_row(row)
             
             # Update status
             self._update_status(f"Checkout complete. Receipt saved to {receipt_path}")
@@ -1154,26 +1606,97 @@ class CashierUI:
 
 
     def _save_product(self):
-        bc, name, price, qty = [v.get() for v in self.inv_vars]
+        # The reorder level field is not stored yet
+        bc, name, price, qty = [v.get() for v in self.inv_vars[:4]]
         try:
-            existing = self.db.get_product_by_barcode(bc)
-            if existing:
-                self.db.update_product(existing['id'], name, price, qty)
-            else:
-                self.db.add_product(bc, name, price, qty)
+            # Insert or update by barcode without a lookup first
+            pid = self.db.upsert_product(bc, name, price, qty)
             messagebox.showinfo("Success", "Product saved.")
             self._clear_form()
-            self._refresh_inventory()
+            self._cache_inventory_row({'id': pid, 'barcode': bc, 'name': name,
+                                       'price': price, 'quantity_in_stock': qty})
         except Exception as e:
             messagebox.showerror("Error", str(e))
 
+    @staticmethod
+    def _inventory_values(row):
+        return (row['id'], row['barcode'], row['name'], _fmt_price(row['price']), row['quantity_in_stock'])
+
+    def _run_in_background(self, work, done, failed=None):
+        """
+        Run work() on a worker thread and hand its result to done() on the
+        Tk thread; failed(), if given, runs before the error is reported.
+        """
+        result = queue.Queue(maxsize=1)
+        
+        def worker():
+            try:
+                result.put((True, work()))
+            except Exception as e:
+                result.put((False, e))
+        
+        def poll():
+            try:
+                ok, value = result.get_nowait()
+            except queue.Empty:
+                self.root.after(BACKGROUND_POLL_MS, poll)
+                return
+            if ok:
+                done(value)
+            else:
+                if failed:
+                    failed(value)
+                messagebox.showerror("Error", str(value))
+                logger.error(f"Background task failed: {value}")
+        
+        threading.Thread(target=worker, daemon=True).start()
+        self.root.after(BACKGROUND_POLL_MS, poll)
+
     def _refresh_inventory(self):
-        for item in self.inv_tv.get_children():
-            self.inv_tv.delete(item)
-        for row in self.db.list_inventory():
-            self.inv_tv.insert("", "end", iid=row['id'], values=(
-                row['id'], row['barcode'], row['name'], f"{row['price']:.2f}", row['quantity_in_stock']
-            ))
+        """Reload the whole inventory from the database, dropping the cache"""
+        self._invalidate_reports()
+        self._inventory_ready = False
+        self._inv_load_id += 1
+        load_id = self._inv_load_id
+        self._update_status("Loading inventory...")
+        self._run_in_background(self.db.list_inventory,
+                                lambda rows: self._apply_inventory_rows(rows, load_id))
+
+    def _apply_inventory_rows(self, rows, load_id):
+        # A newer refresh was started while this one ran
+        if load_id != self._inv_load_id:
+            return
+        self._inventory_ready = True
+        self._inv_cache = {row['id']: row for row in rows}
+        to_values = self._inventory_values
+        self._inv_values = {row['id']: to_values(row) for row in rows}
+        self._show_inventory(keep_position=True)
+        self._update_status(f"Inventory loaded: {len(rows)} products")
+
+    def _cache_inventory_row(self, row):
+        """Store one added or edited product and redraw only its row"""
+        if not self._inventory_ready:
+            # The load in flight may predate this change; fetch again
+            self._refresh_inventory()
+            return
+        self._invalidate_reports()
+        pid = row['id']
+        self._inv_cache[pid] = row
+        values = self._inv_values[pid] = self._inventory_values(row)
+        if self._last_inv_search:
+            # Let the search decide whether the edited row still matches
+            self._show_inventory(keep_position=True)
+        else:
+            self.inv_view.update_row(pid, values)
+
+    def _uncache_inventory_row(self, pid):
+        if not self._inventory_ready:
+            self._refresh_inventory()
+            return
+        self._invalidate_reports()
+        self._inv_cache.pop(pid, None)
+        self._inv_values.pop(pid, None)
+        self.inv_view.remove_row(pid)
 
     def _clear_form(self):
         for v in self.inv_vars:
@@ -1183,89 +1706,77 @@ class CashierUI:
         path = filedialog.asksaveasfilename(defaultextension=".csv",
                                             filetypes=[("CSV Files", "*.csv")])
         if path:
-            export_inventory_csv(self.db, path)
-            messagebox.showinfo("Export", "Inventory exported.")
+            self._update_status("Exporting inventory...")
+            self._run_in_background(lambda: export_inventory_csv(self.db, path),
+                                    lambda _: messagebox.showinfo("Export", "Inventory exported."))
 
     def _import_csv(self):
         path = filedialog.askopenfilename(filetypes=[("CSV Files", "*.csv")])
         if path:
-            import_inventory_csv(self.db, path)
-            messagebox.showinfo("Import", "Inventory imported.")
-            self._refresh_inventory()
+            # Import off the Tk thread; the worker only records its row count
+            # and the status bar picks it up between batches
+            self._import_progress = 0
+            
+            def progress(count):
+                self._import_progress = count
+            
+            def show_progress():
+                if self._import_progress is not None:
+                    self._update_status(f"Importing inventory... {self._import_progress} rows")
+                    self.root.after(IMPORT_PROGRESS_MS, show_progress)
+            
+            def done(count):
+                self._import_progress = None
+                messagebox.showinfo("Import", f"Inventory imported: {count} rows.")
+                self._refresh_inventory()
+            
+            def failed(error):
+                # Batches before the bad row are already committed
+                self._import_progress = None
+                self._refresh_inventory()
+            
+            self._run_in_background(lambda: import_inventory_csv(self.db, path, progress),
+                                    done, failed)
+            show_progress()
     
     def _export_excel(self):
         """Export inventory to Excel file"""
         try:
-            # Check if pandas is available
-            import pandas as pd
+            # Check if openpyxl is available
+            import openpyxl
             
             path = filedialog.asksaveasfilename(defaultextension=".xlsx",
                                                 filetypes=[("Excel Files", "*.xlsx")])
             if path:
-                # Get inventory data
-                products = self.db.get_all_products()
-                
-                # Convert to DataFrame
-                data = []
-                for p in products:
-                    data.append({
-                        'ID': p.id,
-                        'Barcode': p.barcode,
-                        'Name': p.name,
-                        'Category': p.category,
-                        'Price': p.price,
-                        'Stock': p.stock
-                    })
-                
-                df = pd.DataFrame(data)
-                
-                # Export to Excel
-                df.to_excel(path, index=False)
-                
-                messagebox.showinfo("Export", "Inventory exported to Excel.")
+                # Rows are streamed from the database into the sheet on a
+                # worker thread, so the window stays responsive
+                self._update_status("Exporting inventory...")
+                self._run_in_background(lambda: export_inventory_excel(self.db, path),
+                                        lambda _: messagebox.showinfo("Export", "Inventory exported to Excel."))
         except ImportError:
-            messagebox.showerror("Error", "Pandas library not installed. Please install with: pip install pandas openpyxl")
+            messagebox.showerror("Error", "openpyxl library not installed. Please install with: pip install openpyxl")
         except Exception as e:
             messagebox.showerror("Error", f"Failed to export: {str(e)}")
     
     def _import_excel(self):
         """Import inventory from Excel file"""
-        try:
-            # Check if pandas is available
-            import pandas as pd
-            from models import Product
+        path = filedialog.askopenfilename(filetypes=[("Excel Files", "*.xlsx")])
+        if path:
+            self._update_status("Importing inventory...")
             
-            path = filedialog.askopenfilename(filetypes=[("Excel Files", "*.xlsx")])
-            if path:
-                # Read Excel file
-                df = pd.read_excel(path)
-                
-                # Import each product
-                count = 0
-                for _, row in df.iterrows():
-                    try:
-                        # Create product object
-                        product = Product(
-                            id=None,  # Let database assign ID
-                            barcode=row['Barcode'] if 'Barcode' in df.columns else None,
-                            name=row['Name'],
-                            category=row['Category'] if 'Category' in df.columns else 'General',
-                            price=float(row['Price']),
-                            stock=int(row['Stock']) if 'Stock' in df.columns else 0
-                        )
-                        
-                        # Add to database
-                        self.db.add_product(product)
-                        count += 1
-                    except Exception as e:
-                        logger.error(f"Error importing row {_}: {str(e)}")
-                
+            def done(count):
                 messagebox.showinfo("Import", f"{count} products imported from Excel.")
                 self._refresh_inventory()
-        except ImportError:
-            messagebox.showerror("Error", "Pandas library not installed. Please install with: pip install pandas openpyxl")
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to import: {str(e)}")
+            
+            def failed(error):
+                # Batches before the bad row are already committed
+                self._update_status("Import failed")
+                self._refresh_inventory()
+            
+            # The sheet is saved IMPORT_BATCH_SIZE rows per transaction, so
+            # sales can still be recorded while a large file is read
+            self._run_in_background(lambda: import_inventory_excel(self.db, path), done,
+                                    failed)
     
     def _generate_sales_report(self):
         """Generate sales report based on date range"""
@@ -1281,8 +1792,8 @@ class CashierUI:
                 
             try:
                 # Parse dates
-                from_date = datetime.datetime.strptime(date_from, "%Y-%m-%d").date()
-                to_date = datetime.datetime.strptime(date_to, "%Y-%m-%d").date()
+                from_date = _parse_date(date_from)
+                to_date = _parse_date(date_to)
                 
                 # Add one day to to_date to include the end date in the range
                 to_date = to_date + datetime.timedelta(days=1)
@@ -1290,53 +1801,55 @@ class CashierUI:
                 messagebox.showerror("Error", "Invalid date format. Use YYYY-MM-DD")
                 return
                 
-            # Get sales from database
-            sales = self.db.get_sales_by_date_range(from_date, to_date)
-            
-            # Clear the treeview
-            for item in self.sales_tv.get_children():
-                self.sales_tv.delete(item)
-                
+            # Query off the Tk thread and render once the rows arrive; the
+            # summary for a range is reused until the next sale
+            start, end = from_date.isoformat(), to_date.isoformat()
+            summary_cache = self._sales_summary_cache
+            summary = summary_cache.get((start, end))
+            
+            def work():
+                rows = self.db.list_sales(start, end, item_counts=True)
+                return rows, summary or self.db.get_sales_summary(start, end)
+            
+            def done(result):
+                rows, summary = result
+                summary_cache[(start, end)] = summary
+                self._show_sales_report(rows, summary, date_from, date_to)
+            
+            self._update_status("Loading sales report...")
+            self._run_in_background(work, done)
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to generate report: {str(e)}")
+            logger.error(f"Error generating sales report: {str(e)}")
+    
+    def _show_sales_report(self, sales, summary, date_from, date_to):
+        """Fill the sales report tab with rows fetched by _generate_sales_report"""
+        try:
             # Populate treeview with sales data
-            total_sales = 0.0
-            items_count = {}
-            
+            money = self._money
+            rows = []
             for sale in sales:
-                # Parse the sale date and time
-                sale_datetime = datetime.datetime.fromisoformat(sale.date)
-                sale_date = sale_datetime.strftime("%Y-%m-%d")
-                sale_time = sale_datetime.strftime("%H:%M:%S")
-                
-                # Count items for best selling product
-                for item in sale.items:
-                    if item.product_name in items_count:
-                        items_count[item.product_name] += item.quantity
-                    else:
-                        items_count[item.product_name] = item.quantity
-                
-                # Add to treeview
-                self.sales_tv.insert("", tk.END, values=(
-                    sale.id,
-                    sale_date,
-                    sale_time,
-                    len(sale.items),
-                    f"{self.currency}{sale.total:.2f}",
-                    sale.payment_method
-                ))
-                
-                total_sales += sale.total
-            
-            # Update summary statistics
-            self.total_sales_var.set(f"{self.currency}{total_sales:.2f}")
-            self.num_trans_var.set(str(len(sales)))
-            
-            # Calculate average sale
-            avg_sale = total_sales / len(sales) if sales else 0
-            self.avg_sale_var.set(f"{self.currency}{avg_sale:.2f}")
-            
-            # Find best selling item
-            best_item = max(items_count.items(), key=lambda x: x[1])[0] if items_count else "None"
-            self.best_item_var.set(best_item)
+                # Timestamps are stored as ISO YYYY-MM-DDTHH:MM:SS; each
+                # column is read from the row once
+                sale_id = sale['id']
+                stamp = sale['timestamp']
+                rows.append((sale_id, (
+                    sale_id,
+                    stamp[:10],
+                    stamp[11:19],
+                    sale['item_count'],
+                    money(sale['total']),
+                    ""
+                )))
+            
+            self.sales_view.set_rows(rows)
+            self._report_sales = {sale['id']: sale for sale in sales}
+            
+            # Update summary statistics from the SQL aggregates
+            self._set_if_changed(self.total_sales_var, money(summary['total']))
+            self._set_if_changed(self.num_trans_var, str(summary['count']))
+            self._set_if_changed(self.avg_sale_var, money(summary['avg']))
+            self._set_if_changed(self.best_item_var, summary['best_item'] or "None")
             
             # Update status
             self._update_status(f"Generated sales report from {date_from} to {date_to}")
@@ -1352,14 +1865,15 @@ class CashierUI:
             if not selection:
                 return
                 
-            # Get sale ID from the first column
-            sale_id = self.sales_tv.item(selection[0], 'values')[0]
-            
-            # Get sale from database
-            sale = self.db.get_sale_by_id(sale_id)
+            # Sales report rows use the sale id as their iid, and the sale
+            # itself is kept from when the report was drawn; only its line
+            # items need a query
+            sale_id = int(selection[0])
+            sale = self._report_sales.get(sale_id)
             if not sale:
                 messagebox.showerror("Error", f"Sale #{sale_id} not found")
                 return
+            items = self.db.get_sale_items(sale_id)
                 
             # Create a new dialog window
             details_window = tk.Toplevel(self.root)
@@ -1372,16 +1886,13 @@ class CashierUI:
             info_frame = ttk.LabelFrame(details_window, text="Sale Information")
             info_frame.pack(fill=tk.X, padx=10, pady=5)
             
-            # Parse the sale date and time
-            sale_datetime = datetime.datetime.fromisoformat(sale.date)
-            sale_date = sale_datetime.strftime("%Y-%m-%d")
-            sale_time = sale_datetime.strftime("%H:%M:%S")
+            # Timestamps are stored as ISO YYYY-MM-DDTHH:MM:SS
+            stamp = sale['timestamp']
             
             # Sale info
-            ttk.Label(info_frame, text=f"Date: {sale_date}").grid(row=0, column=0, padx=5, pady=2, sticky=tk.W)
-            ttk.Label(info_frame, text=f"Time: {sale_time}").grid(row=0, column=1, padx=5, pady=2, sticky=tk.W)
-            ttk.Label(info_frame, text=f"Payment: {sale.payment_method}").grid(row=1, column=0, padx=5, pady=2, sticky=tk.W)
-            ttk.Label(info_frame, text=f"Total: {self.currency}{sale.total:.2f}").grid(row=1, column=1, padx=5, pady=2, sticky=tk.W)
+            ttk.Label(info_frame, text=f"Date: {stamp[:10]}").grid(row=0, column=0, padx=5, pady=2, sticky=tk.W)
+            ttk.Label(info_frame, text=f"Time: {stamp[11:19]}").grid(row=0, column=1, padx=5, pady=2, sticky=tk.W)
+            ttk.Label(info_frame, text=f"Total: {self._money(sale['total'])}").grid(row=1, column=1, padx=5, pady=2, sticky=tk.W)
             
             # Items frame
             items_frame = ttk.LabelFrame(details_window, text="Items")
@@ -1408,15 +1919,19 @@ class CashierUI:
             scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
             items_tv.pack(fill=tk.BOTH, expand=True)
             
-            # Add items to treeview
-            for item in sale.items:
-                subtotal = item.price * item.quantity
-                items_tv.insert("", tk.END, values=(
-                    item.product_name,
-                    f"${item.price:.2f}",
-                    item.quantity,
-                    f"${subtotal:.2f}"
-                ))
+            # Add items to treeview; the unit price is what was charged,
+            # not the product's current price. Rows are built up front and
+            # inserted with direct Tcl calls, as in VirtualTreeview
+            money = self._money
+            rows = [(
+                item['name'],
+                money(item['line_total'] / item['quantity']),
+                item['quantity'],
+                money(item['line_total'])
+            ) for item in items]
+            call, widget = items_tv.tk.call, items_tv._w
+            for values in rows:
+                call(widget, "insert", "", "end", "-values", values)
                 
             # Buttons frame
             buttons_frame = ttk.Frame(details_window)
@@ -1438,17 +1953,24 @@ class CashierUI:
         """Print receipt for a sale"""
         try:
             # Get sale from database
-            sale = self.db.get_sale_by_id(sale_id)
-            if not sale:
+            details = self.db.get_sale_details(sale_id)
+            if not details:
                 messagebox.showerror("Error", f"Sale #{sale_id} not found")
                 return
+            sale = details['sale']
+            
+            # Stored timestamps are ISO text; swapping the separator gives
+            # the printed form without parsing. Line values are worked out
+            # once for whichever format gets written
+            sale_date = sale['timestamp'].replace("T", " ")
+            lines = [(item['name'], item['line_total'] / item['quantity'], item['quantity'], item['line_total'])
+                     for item in details['items']]
                 
             # Try to use ReportLab for PDF generation
             try:
-                from reportlab.lib.pagesizes import letter
-                from reportlab.lib import colors
-                from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-                from reportlab.lib.styles import getSampleStyleSheet
+                rl = load_reportlab()
+                pdf = pdf_styles()
+                styles, table_style = pdf.sheet, pdf.sale_receipt_table
                 
                 # Ask user for save location
                 file_path = filedialog.asksaveasfilename(
@@ -1461,71 +1983,50 @@ class CashierUI:
                     return  # User cancelled
                     
                 # Create PDF document
-                doc = SimpleDocTemplate(file_path, pagesize=letter)
+                doc = rl.SimpleDocTemplate(file_path, pagesize=rl.letter)
                 elements = []
                 
                 # Styles
-                styles = getSampleStyleSheet()
                 title_style = styles['Heading1']
                 subtitle_style = styles['Heading2']
                 normal_style = styles['Normal']
                 
                 # Store name and header
-                elements.append(Paragraph(f"{self.config.get('store_name', 'POS System')}", title_style))
-                elements.append(Spacer(1, 12))
-                elements.append(Paragraph(f"Receipt #{sale_id}", subtitle_style))
-                elements.append(Spacer(1, 12))
+                elements.append(rl.Paragraph(f"{self.config.get('store_name', 'POS System')}", title_style))
+                elements.append(rl.Spacer(1, 12))
+                elements.append(rl.Paragraph(f"Receipt #{sale_id}", subtitle_style))
+                elements.append(rl.Spacer(1, 12))
                 
                 # Sale info
-                sale_datetime = datetime.datetime.fromisoformat(sale.date)
-                elements.append(Paragraph(f"Date: {sale_datetime.strftime('%Y-%m-%d %H:%M:%S')}", normal_style))
-                elements.append(Paragraph(f"Payment Method: {sale.payment_method}", normal_style))
-                elements.append(Spacer(1, 12))
+                elements.append(rl.Paragraph(f"Date: {sale_date}", normal_style))
+                elements.append(rl.Spacer(1, 12))
                 
                 # Items table
+                money = self._money
                 data = [["Item", "Price", "Qty", "Subtotal"]]
-                for item in sale.items:
-                    subtotal = item.price * item.quantity
-                    data.append([item.product_name, f"{self.currency}{item.price:.2f}", str(item.quantity), f"{self.currency}{subtotal:.2f}"])
+                data.extend([name, money(price), str(qty), money(subtotal)]
+                            for name, price, qty, subtotal in lines)
                 
                 # Add total row
-                data.append(["Total", "", "", f"{self.currency}{sale.total:.2f}"])
+                data.append(["Total", "", "", money(sale['total'])])
                 
                 # Create table
-                table = Table(data, colWidths=[250, 75, 50, 100])
-                table.setStyle(TableStyle([
-                    ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-                    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                    ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
-                    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                    ('FONTSIZE', (0, 0), (-1, 0), 12),
-                    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                    ('BACKGROUND', (0, -1), (-1, -1), colors.grey),
-                    ('TEXTCOLOR', (0, -1), (-1, -1), colors.whitesmoke),
-                    ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
-                    ('ALIGN', (0, -1), (-1, -1), 'RIGHT'),
-                    ('ALIGN', (1, 1), (-1, -1), 'RIGHT'),
-                    ('GRID', (0, 0), (-1, -2), 1, colors.black),
-                ]))
+                table = rl.Table(data, colWidths=[250, 75, 50, 100])
+                table.setStyle(table_style)
                 
                 elements.append(table)
-                elements.append(Spacer(1, 20))
+                elements.append(rl.Spacer(1, 20))
                 
                 # Footer
-                elements.append(Paragraph(f"Thank you for your purchase!", normal_style))
+                elements.append(rl.Paragraph(f"Thank you for your purchase!", normal_style))
                 
-                # Build PDF
-                doc.build(elements)
+                # Lay out and write the PDF on a worker thread
+                def done(_):
+                    _open_file(file_path)
+                    self._update_status(f"Receipt for sale #{sale_id} saved to {file_path}")
                 
-                # Open the PDF
-                import os
-                import subprocess
-                if os.name == 'nt':  # Windows
-                    os.startfile(file_path)
-                elif os.name == 'posix':  # macOS or Linux
-                    subprocess.call(['open', file_path])
-                    
-                self._update_status(f"Receipt for sale #{sale_id} saved to {file_path}")
+                self._update_status(f"Saving receipt for sale #{sale_id}...")
+                self._run_in_background(lambda: doc.build(elements), done)
                 
             except ImportError:
                 # ReportLab not available, use text file instead
@@ -1538,40 +2039,38 @@ class CashierUI:
                 if not file_path:
                     return  # User cancelled
                     
-                with open(file_path, 'w') as f:
+                # Build the whole receipt in memory and write it in one go
+                cur = self.currency
+                parts = [
                     # Store name and header
-                    f.write(f"{self.config.get('store_name', 'POS System')}\n")
-                    f.write(f"Receipt #{sale_id}\n")
-                    f.write("-" * 40 + "\n\n")
-                    
+                    f"{self.config.get('store_name', 'POS System')}",
+                    f"Receipt #{sale_id}",
+                    "-" * 40,
+                    "",
                     # Sale info
-                    sale_datetime = datetime.datetime.fromisoformat(sale.date)
-                    f.write(f"Date: {sale_datetime.strftime('%Y-%m-%d %H:%M:%S')}\n")
-                    f.write(f"Payment Method: {sale.payment_method}\n\n")
-                    
+                    f"Date: {sale_date}",
+                    "",
                     # Items header
-                    f.write(f"{'Item':<30}{'Price':>10}{'Qty':>5}{'Subtotal':>10}\n")
-                    f.write("-" * 55 + "\n")
-                    
-                    # Items
-                    for item in sale.items:
-                        subtotal = item.price * item.quantity
-                        f.write(f"{item.product_name:<30}{self.currency}{item.price:>9.2f}{item.quantity:>5}{self.currency}{subtotal:>9.2f}\n")
-                    
-                    # Total
-                    f.write("-" * 55 + "\n")
-                    f.write(f"{'Total':>45}{self.currency}{sale.total:>9.2f}\n\n")
-                    
-                    # Footer
-                    f.write("Thank you for your purchase!\n")
+                    f"{'Item':<30}{'Price':>10}{'Qty':>5}{'Subtotal':>10}",
+                    "-" * 55,
+                ]
+                # Items
+                parts.extend(f"{name:<30}{cur}{price:>9.2f}{qty:>5}{cur}{subtotal:>9.2f}"
+                             for name, price, qty, subtotal in lines)
+                # Total and footer
+                parts += [
+                    "-" * 55,
+                    f"{'Total':>45}{cur}{sale['total']:>9.2f}",
+                    "",
+                    "Thank you for your purchase!",
+                    "",
+                ]
+                
+                with open(file_path, 'w') as f:
+                    f.write("\n".join(parts))
                 
                 # Open the text file
-                import os
-                import subprocess
-                if os.name == 'nt':  # Windows
-                    os.startfile(file_path)
-                elif os.name == 'posix':  # macOS or Linux
-                    subprocess.call(['open', file_path])
+                _open_file(file_path)
                     
                 self._update_status(f"Receipt for sale #{sale_id} saved to {file_path}")
                 
@@ -1593,8 +2092,8 @@ class CashierUI:
                 
             try:
                 # Parse dates
-                from_date = datetime.datetime.strptime(date_from, "%Y-%m-%d").date()
-                to_date = datetime.datetime.strptime(date_to, "%Y-%m-%d").date()
+                from_date = _parse_date(date_from)
+                to_date = _parse_date(date_to)
                 
                 # Add one day to to_date to include the end date in the range
                 to_date = to_date + datetime.timedelta(days=1)
@@ -1602,10 +2101,11 @@ class CashierUI:
                 messagebox.showerror("Error", "Invalid date format. Use YYYY-MM-DD")
                 return
                 
-            # Get sales from database
-            sales = self.db.get_sales_by_date_range(from_date, to_date)
+            # One row per sold line, filtered on the timestamp index
+            start, end = from_date.isoformat(), to_date.isoformat()
+            lines = self.db.list_sale_lines(start, end)
             
-            if not sales:
+            if not lines:
                 messagebox.showinfo("Info", "No sales found in the selected date range")
                 return
                 
@@ -1617,7 +2117,7 @@ class CashierUI:
             
             if export_format:  # Excel
                 try:
-                    import pandas as pd
+                    from openpyxl import Workbook
                     
                     # Ask user for save location
                     file_path = filedialog.asksaveasfilename(
@@ -1629,77 +2129,52 @@ class CashierUI:
                     if not file_path:
                         return  # User cancelled
                         
-                    # Prepare data for Excel
-                    sales_data = []
-                    for sale in sales:
-                        sale_datetime = datetime.datetime.fromisoformat(sale.date)
-                        sale_date = sale_datetime.strftime("%Y-%m-%d")
-                        sale_time = sale_datetime.strftime("%H:%M:%S")
-                        
-                        # Add each item as a separate row
-                        for item in sale.items:
-                            sales_data.append({
-                                "Sale ID": sale.id,
-                                "Date": sale_date,
-                                "Time": sale_time,
-                                "Product": item.product_name,
-                                "Price": item.price,
-                                "Quantity": item.quantity,
-                                "Subtotal": item.price * item.quantity,
-                                "Payment Method": sale.payment_method
-                            })
-                    
-                    # Create DataFrame and export to Excel
-                    df = pd.DataFrame(sales_data)
+                    # Building and writing the workbook runs on a worker
+                    # thread; the Tk thread only reports the result
+                    cached_summary = self._sales_summary_cache.get((start, end))
                     
-                    # Create Excel writer with multiple sheets
-                    with pd.ExcelWriter(file_path, engine='openpyxl') as writer:
-                        # Detailed sales sheet
-                        df.to_excel(writer, sheet_name="Detailed Sales", index=False)
+                    def write_excel():
+                        # A write-only workbook streams each row out as it is
+                        # appended instead of keeping a cell object per value
+                        wb = Workbook(write_only=True)
                         
-                        # Summary sheet
-                        summary_data = {
-                            "Metric": ["Total Sales", "Number of Transactions", "Average Sale", "Best Selling Item"],
-                            "Value": [
-                                f"{self.currency}{sum(sale.total for sale in sales):.2f}",
-                                str(len(sales)),
-                                f"{self.currency}{sum(sale.total for sale in sales) / len(sales):.2f}" if sales else f"{self.currency}0.00",
-                                self.best_item_var.get()
-                            ]
-                        }
-                        pd.DataFrame(summary_data).to_excel(writer, sheet_name="Summary", index=False)
+                        # Detailed sales sheet; timestamps are ISO text, so
+                        # date and time are fixed slices
+                        ws = wb.create_sheet("Detailed Sales")
+                        ws.append(("Sale ID", "Date", "Time", "Product", "Price", "Quantity", "Subtotal"))
+                        for sale_id, stamp, name, quantity, line_total in lines:
+                            ws.append((sale_id, stamp[:10], stamp[11:19], name,
+                                       line_total / quantity, quantity, line_total))
                         
-                        # Product summary sheet (aggregated by product)
-                        product_summary = {}
-                        for sale in sales:
-                            for item in sale.items:
-                                if item.product_name in product_summary:
-                                    product_summary[item.product_name]["Quantity"] += item.quantity
-                                    product_summary[item.product_name]["Total"] += item.price * item.quantity
-                                else:
-                                    product_summary[item.product_name] = {
-                                        "Product": item.product_name,
-                                        "Price": item.price,
-                                        "Quantity": item.quantity,
-                                        "Total": item.price * item.quantity
-                                    }
+                        # Summary sheet, from the same aggregates as the report tab
+                        summary = cached_summary or self.db.get_sales_summary(start, end)
+                        ws = wb.create_sheet("Summary")
+                        ws.append(("Metric", "Value"))
+                        ws.append(("Total Sales", self._money(summary['total'])))
+                        ws.append(("Number of Transactions", str(summary['count'])))
+                        ws.append(("Average Sale", self._money(summary['avg'])))
+                        ws.append(("Best Selling Item", summary['best_item'] or "None"))
                         
-                        pd.DataFrame(list(product_summary.values())).to_excel(
-                            writer, sheet_name="Product Summary", index=False
-                        )
+                        # Product summary sheet, aggregated by SQLite
+                        ws = wb.create_sheet("Product Summary")
+                        ws.append(("Product", "Price", "Quantity", "Total"))
+                        for name, quantity, total in self.db.list_product_sales(start, end):
+                            ws.append((name, total / quantity, quantity, total))
+                        
+                        wb.save(file_path)
                     
-                    messagebox.showinfo("Export", f"Sales report exported to {file_path}")
-                    self._update_status(f"Sales report exported to Excel: {file_path}")
+                    def done(_):
+                        messagebox.showinfo("Export", f"Sales report exported to {file_path}")
+                        self._update_status(f"Sales report exported to Excel: {file_path}")
+                        
+                        # Open the Excel file
+                        _open_file(file_path)
                     
-                    # Open the Excel file
-                    import os
-                    if os.name == 'nt':  # Windows
-                        os.startfile(file_path)
-                    elif os.name == 'posix':  # macOS or Linux
-                        subprocess.call(['open', file_path])
+                    self._update_status("Exporting sales report...")
+                    self._run_in_background(write_excel, done)
                         
                 except ImportError:
-                    messagebox.showerror("Error", "Pandas library not installed. Please install with: pip install pandas openpyxl")
+                    messagebox.showerror("Error", "openpyxl library not installed. Please install with: pip install openpyxl")
                     # Fall back to CSV export
                     export_format = False
             
@@ -1714,40 +2189,35 @@ class CashierUI:
                 if not file_path:
                     return  # User cancelled
                     
-                # Write CSV file
-                with open(file_path, 'w', newline='') as csvfile:
-                    writer = csv.writer(csvfile)
+                # Write CSV file on a worker thread
+                def write_csv():
+                    with open(file_path, 'w', newline='', buffering=EXPORT_BUFFER_SIZE) as csvfile:
+                        writer = csv.writer(csvfile)
                     
-                    # Write header
-                    writer.writerow(["Sale ID", "Date", "Time", "Product", "Price", "Quantity", "Subtotal", "Payment Method"])
+                        # Write header
+                        writer.writerow(["Sale ID", "Date", "Time", "Product", "Price", "Quantity", "Subtotal"])
                     
-                    # Write data
-                    for sale in sales:
-                        sale_datetime = datetime.datetime.fromisoformat(sale.date)
-                        sale_date = sale_datetime.strftime("%Y-%m-%d")
-                        sale_time = sale_datetime.strftime("%H:%M:%S")
-                        
-                        for item in sale.items:
-                            writer.writerow([
-                                sale.id,
-                                sale_date,
-                                sale_time,
-                                item.product_name,
-                                f"{self.currency}{item.price:.2f}",
-                                item.quantity,
-                                f"{self.currency}{item.price * item.quantity:.2f}",
-                                sale.payment_method
-                            ])
+                        # Write data; timestamps are sliced rather than parsed
+                        money = self._money
+                        writer.writerows([
+                            line['sale_id'],
+                            line['timestamp'][:10],
+                            line['timestamp'][11:19],
+                            line['product_name'],
+                            money(line['line_total'] / line['quantity']),
+                            line['quantity'],
+                            money(line['line_total'])
+                        ] for line in lines)
                 
-                messagebox.showinfo("Export", f"Sales report exported to {file_path}")
-                self._update_status(f"Sales report exported to CSV: {file_path}")
+                def done(_):
+                    messagebox.showinfo("Export", f"Sales report exported to {file_path}")
+                    self._update_status(f"Sales report exported to CSV: {file_path}")
+                    
+                    # Open the CSV file
+                    _open_file(file_path)
                 
-                # Open the CSV file
-                import os
-                if os.name == 'nt':  # Windows
-                    os.startfile(file_path)
-                elif os.name == 'posix':  # macOS or Linux
-                    subprocess.call(['open', file_path])
+                self._update_status("Exporting sales report...")
+                self._run_in_background(write_csv, done)
                     
         except Exception as e:
             messagebox.showerror("Error", f"Failed to export sales report: {str(e)}")
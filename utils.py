@@ -1,174 +1,383 @@
 # utils.py
 import os
-import pandas as pd
+import csv
+import copy
 import datetime
+from functools import lru_cache
+from operator import itemgetter
+from types import SimpleNamespace
 from database import Database
 
-# For PDF generation
-try:
-    from reportlab.lib.pagesizes import letter
-    from reportlab.lib import colors
-    from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-    from reportlab.lib.units import inch
-    REPORTLAB_AVAILABLE = True
-except ImportError:
-    REPORTLAB_AVAILABLE = False
-    print("ReportLab not installed. PDF generation will not be available.")
-    print("Install with: pip install reportlab")
+# pandas and ReportLab take a noticeable share of startup to import and are
+# only needed for Excel files, reports and PDFs, so they load on first use
+@lru_cache(maxsize=None)
+def load_pandas():
+    """Return the pandas module, importing it on the first call."""
+    import pandas
+    return pandas
+
+@lru_cache(maxsize=None)
+def load_reportlab():
+    """Return the ReportLab names used for PDFs, importing them on the first call."""
+    try:
+        from reportlab.lib.pagesizes import letter
+        from reportlab.lib import colors
+        from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+        from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+        from reportlab.lib.units import inch
+    except ImportError:
+        raise ImportError("ReportLab is not installed. Install with: pip install reportlab") from None
+    return SimpleNamespace(letter=letter, colors=colors, SimpleDocTemplate=SimpleDocTemplate,
+                           Table=Table, TableStyle=TableStyle, Paragraph=Paragraph,
+                           Spacer=Spacer, getSampleStyleSheet=getSampleStyleSheet,
+                           ParagraphStyle=ParagraphStyle, inch=inch)
+
+# Rows written per transaction when importing inventory
+IMPORT_BATCH_SIZE = 1000
+
+# Write buffer for CSV exports, so large files go out in few, big writes
+EXPORT_BUFFER_SIZE = 1 << 20
+
+# Data rows per table in PDF reports
+PDF_REPORT_TABLE_ROWS = 40
+
+# Column headings of the items table on PDF receipts
+PDF_RECEIPT_HEADER = ("Item", "Quantity", "Price", "Total")
+
+def _rows_to_frame(rows):
+    """Build a DataFrame from sqlite3.Row results, keeping column names."""
+    pd = load_pandas()
+    return pd.DataFrame(rows, columns=rows[0].keys() if rows else None)
+
+def _frame_to_excel(df, file_path: str, sheet_name: str):
+    """
+    Write a DataFrame to a one-sheet workbook. With xlsxwriter the rows go
+    out in constant_memory mode, flushed to disk as each one is written;
+    without it, pandas' default engine is used.
+    """
+    try:
+        from xlsxwriter import Workbook
+    except ImportError:
+        df.to_excel(file_path, index=False, sheet_name=sheet_name)
+        return
+    # constant_memory needs strictly row-by-row writes, which to_excel does
+    # not do, so rows are written here; missing values become blank cells
+    wb = Workbook(file_path, {'constant_memory': True})
+    try:
+        ws = wb.add_worksheet(sheet_name)
+        ws.write_row(0, 0, [str(c) for c in df.columns])
+        for r, row in enumerate(df.itertuples(index=False, name=None), 1):
+            ws.write_row(r, 0, [None if v != v else v for v in row])
+    finally:
+        wb.close()
 
 def export_inventory_csv(db: Database, file_path: str):
-    """Dump inventory to CSV."""
-    df = pd.DataFrame(db.list_inventory())
-    df.to_csv(file_path, index=False)
+    """Dump inventory to CSV, streaming rows from the database."""
+    with open(file_path, 'w', newline='', buffering=EXPORT_BUFFER_SIZE) as f:
+        csv.writer(f).writerows(db.iter_inventory())
     return file_path
 
 def export_inventory_excel(db: Database, file_path: str):
-    """Export inventory to Excel format."""
+    """Export inventory to Excel format, streaming rows into the sheet."""
     try:
-        df = pd.DataFrame(db.list_inventory())
-        df.to_excel(file_path, index=False, sheet_name='Inventory')
+        from openpyxl import Workbook
+        # Write-only workbooks flush rows to disk instead of keeping cells
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet('Inventory')
+        for row in db.iter_inventory():
+            ws.append(tuple(row))
+        wb.save(file_path)
         return file_path
     except Exception as e:
         raise Exception(f"Failed to export to Excel: {str(e)}")
 
-def import_inventory_csv(db: Database, file_path: str):
+def _column_index(header, column):
+    """Position of column in a file's header row, naming it if it is missing."""
+    try:
+        return header.index(column)
+    except ValueError:
+        raise ValueError(f"Missing required column '{column}'") from None
+
+def _parse_qty(value):
+    """Stock quantity from a CSV or Excel cell; '4.0' reads as 4, blank as 0."""
+    return int(float(value)) if value not in (None, '') else 0
+
+def import_inventory_csv(db: Database, file_path: str, progress=None):
     """
     Read CSV with columns barcode,name,price,quantity_in_stock
     and upsert into products table.
+
+    The file is streamed and written IMPORT_BATCH_SIZE rows per
+    transaction; progress, if given, is called with the running row count
+    after each batch.
     """
-    df = pd.read_csv(file_path)
-    for _, row in df.iterrows():
-        existing = db.get_product_by_barcode(row['barcode'])
-        if existing:
-            db.update_product(existing['id'], row['name'],
-                              float(row['price']), int(row['quantity_in_stock']))
-        else:
-            db.add_product(row['barcode'], row['name'],
-                           float(row['price']), int(row['quantity_in_stock']))
-    return len(df)
-
-def import_inventory_excel(db: Database, file_path: str):
+    count = 0
+    batch = []
+    # utf-8-sig drops the byte order mark Excel writes in "CSV UTF-8" files
+    with open(file_path, newline='', encoding='utf-8-sig') as f:
+        reader = csv.reader(f)
+        header = next(reader, None)
+        if header is None:
+            return 0
+        # Plain list rows picked by column position; DictReader would build
+        # a dict for every line
+        pick = itemgetter(*(_column_index(header, col) for col in
+                            ('barcode', 'name', 'price', 'quantity_in_stock')))
+        for row in reader:
+            # Blank lines come back as empty rows
+            if not row:
+                continue
+            barcode, name, price, qty = pick(row)
+            batch.append((barcode, name, float(price), _parse_qty(qty)))
+            if len(batch) == IMPORT_BATCH_SIZE:
+                db.upsert_products(batch)
+                count += len(batch)
+                batch.clear()
+                if progress:
+                    progress(count)
+    if batch:
+        db.upsert_products(batch)
+        count += len(batch)
+        if progress:
+            progress(count)
+    return count
+
+def _excel_rows(file_path: str):
+    """
+    Yield the rows of a workbook's first sheet as sequences of cell values,
+    streaming them. python-calamine's Rust parser is used when installed,
+    otherwise openpyxl in read-only mode; empty cells may come back as None
+    or ''.
+    """
+    try:
+        from python_calamine import CalamineWorkbook
+    except ImportError:
+        from openpyxl import load_workbook
+        wb = load_workbook(file_path, read_only=True, data_only=True)
+        try:
+            yield from wb.worksheets[0].iter_rows(values_only=True)
+        finally:
+            wb.close()
+    else:
+        wb = CalamineWorkbook.from_path(file_path)
+        try:
+            yield from wb.get_sheet_by_index(0).iter_rows()
+        finally:
+            wb.close()
+
+def _cell_text(value):
+    """Cell value as text, without the .0 a whole number read as float gets."""
+    if isinstance(value, float) and value.is_integer():
+        value = int(value)
+    return str(value)
+
+def import_inventory_excel(db: Database, file_path: str, progress=None):
     """
     Read Excel file with columns barcode,name,price,quantity_in_stock
     and upsert into products table.
+
+    The sheet is streamed through _excel_rows and parsed into batches of
+    IMPORT_BATCH_SIZE rows, each written in its own transaction, so the
+    write lock is only held while a ready batch is saved. progress, if
+    given, is called with the running row count after each batch. Header
+    case is ignored, a Stock column is accepted for quantity_in_stock, and
+    rows without a barcode or name are skipped.
     """
     try:
-        df = pd.read_excel(file_path)
-        for _, row in df.iterrows():
-            existing = db.get_product_by_barcode(row['barcode'])
-            if existing:
-                db.update_product(existing['id'], row['name'],
-                                float(row['price']), int(row['quantity_in_stock']))
-            else:
-                db.add_product(row['barcode'], row['name'],
-                            float(row['price']), int(row['quantity_in_stock']))
-        return len(df)
+        rows = _excel_rows(file_path)
+        try:
+            header = [str(c).strip().lower() if c is not None else '' for c in next(rows, ())]
+            header = ['quantity_in_stock' if c == 'stock' else c for c in header]
+            b, n, p = (_column_index(header, col) for col in ('barcode', 'name', 'price'))
+            q = header.index('quantity_in_stock') if 'quantity_in_stock' in header else None
+            width = max(b, n, p, -1 if q is None else q) + 1
+            count = 0
+            batch = []
+            for row in rows:
+                if len(row) < width:
+                    row = tuple(row) + (None,) * (width - len(row))
+                barcode, name = row[b], row[n]
+                if barcode in (None, '') or name in (None, ''):
+                    continue
+                qty = row[q] if q is not None else None
+                # Barcodes are kept as text so stored ones keep leading zeros
+                batch.append((_cell_text(barcode).strip(), _cell_text(name), float(row[p]),
+                              _parse_qty(qty)))
+                if len(batch) == IMPORT_BATCH_SIZE:
+                    db.upsert_products(batch)
+                    count += len(batch)
+                    batch.clear()
+                    if progress:
+                        progress(count)
+            if batch:
+                db.upsert_products(batch)
+                count += len(batch)
+                if progress:
+                    progress(count)
+            return count
+        finally:
+            rows.close()
     except Exception as e:
         raise Exception(f"Failed to import from Excel: {str(e)}")
 
 def generate_txt_receipt(receipt: dict, file_path: str, currency="$"):
     """Write a simple text receipt."""
+    # The receipt is assembled in memory and written with one call
+    parts = [
+        f"Date: {receipt['timestamp']}\n",
+        "-" * 30 + "\n",
+        "Item               QTY   Price   Total\n",
+    ]
+    parts.extend(f"{name[:15]:15} {qty:3}  {currency}{price:6.2f} {currency}{line:7.2f}\n"
+                 for name, qty, price, line in receipt['items'])
+    parts += [
+        "-" * 30 + "\n",
+        f"Subtotal:     {currency}{receipt['subtotal']:8.2f}\n",
+        f"Taxed:        {currency}{receipt['taxed']:8.2f}\n",
+        f"Discount:     {currency}{receipt['discount']:8.2f}\n",
+        f"Total:        {currency}{receipt['total']:8.2f}\n",
+    ]
+    
+    # Add payment method if available
+    if 'payment_method' in receipt:
+        parts.append(f"Payment:      {receipt['payment_method']}\n")
+    
+    parts.append("-" * 30 + "\n")
+    parts.append("Thank you for your purchase!\n")
+    
     with open(file_path, 'w') as f:
-        f.write(f"Date: {receipt['timestamp']}\n")
-        f.write("-" * 30 + "\n")
-        f.write("Item               QTY   Price   Total\n")
-        for name, qty, price, line in receipt['items']:
-            f.write(f"{name[:15]:15} {qty:3}  {currency}{price:6.2f} {currency}{line:7.2f}\n")
-        f.write("-" * 30 + "\n")
-        f.write(f"Subtotal:     {currency}{receipt['subtotal']:8.2f}\n")
-        f.write(f"Taxed:        {currency}{receipt['taxed']:8.2f}\n")
-        f.write(f"Discount:     {currency}{receipt['discount']:8.2f}\n")
-        f.write(f"Total:        {currency}{receipt['total']:8.2f}\n")
-        
-        # Add payment method if available
-        if 'payment_method' in receipt:
-            f.write(f"Payment:      {receipt['payment_method']}\n")
-            
-        f.write("-" * 30 + "\n")
-        f.write("Thank you for your purchase!\n")
+        f.write("".join(parts))
     return file_path
 
 
+@lru_cache(maxsize=None)
+def pdf_styles():
+    """
+    Return the paragraph stylesheet (with RightAlign added) and the table
+    styles used by every PDF this app writes, built on the first call and
+    shared by the rest. Raises ImportError when ReportLab is missing.
+
+    The namespace holds sheet, receipt_table (checkout receipts),
+    sale_receipt_table (receipts reprinted from sales history, with a
+    shaded total row), report_summary and report_data.
+    """
+    rl = load_reportlab()
+    sheet = rl.getSampleStyleSheet()
+    sheet.add(rl.ParagraphStyle(
+        name='RightAlign',
+        parent=sheet['Normal'],
+        alignment=2,  # 2 is right alignment
+    ))
+    # Grey, bold, centred header row shared by all the tables
+    header = [
+        ('BACKGROUND', (0, 0), (-1, 0), rl.colors.grey),
+        ('TEXTCOLOR', (0, 0), (-1, 0), rl.colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+    ]
+    return SimpleNamespace(
+        sheet=sheet,
+        receipt_table=rl.TableStyle(header + [
+            ('FONTSIZE', (0, 0), (-1, 0), 12),
+            ('BACKGROUND', (0, 1), (-1, -1), rl.colors.white),
+            ('GRID', (0, 0), (-1, -2), 1, rl.colors.black),
+            ('ALIGN', (1, 1), (-1, -1), 'RIGHT'),
+            ('FONTNAME', (0, -5), (-1, -1), 'Helvetica-Bold'),
+        ]),
+        sale_receipt_table=rl.TableStyle(header + [
+            ('FONTSIZE', (0, 0), (-1, 0), 12),
+            ('BACKGROUND', (0, -1), (-1, -1), rl.colors.grey),
+            ('TEXTCOLOR', (0, -1), (-1, -1), rl.colors.whitesmoke),
+            ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
+            ('ALIGN', (0, -1), (-1, -1), 'RIGHT'),
+            ('ALIGN', (1, 1), (-1, -1), 'RIGHT'),
+            ('GRID', (0, 0), (-1, -2), 1, rl.colors.black),
+        ]),
+        report_summary=rl.TableStyle(header + [
+            ('FONTSIZE', (0, 0), (-1, 0), 12),
+            ('BACKGROUND', (0, 1), (-1, -1), rl.colors.white),
+            ('GRID', (0, 0), (-1, -1), 1, rl.colors.black),
+        ]),
+        report_data=rl.TableStyle(header + [
+            ('FONTSIZE', (0, 0), (-1, 0), 10),
+            ('BACKGROUND', (0, 1), (-1, -1), rl.colors.white),
+            ('GRID', (0, 0), (-1, -1), 1, rl.colors.black),
+            ('FONTSIZE', (0, 1), (-1, -1), 8),
+        ]),
+    )
+
+
+@lru_cache(maxsize=128)
+def _receipt_paragraph(text, style_name):
+    """
+    Parsed receipt Paragraph for fixed text. Layout state is stored on the
+    Paragraph and receipts may be built on several threads, so callers
+    append a copy.copy() of it, which shares the parsed markup.
+    """
+    rl = load_reportlab()
+    return rl.Paragraph(text, pdf_styles().sheet[style_name])
+
+
 def generate_pdf_receipt(receipt: dict, file_path: str, currency="$"):
     """Generate a PDF receipt using ReportLab."""
-    if not REPORTLAB_AVAILABLE:
-        raise ImportError("ReportLab is not installed. Cannot generate PDF.")
+    rl = load_reportlab()
     
     # Create the PDF document
-    doc = SimpleDocTemplate(file_path, pagesize=letter)
+    doc = rl.SimpleDocTemplate(file_path, pagesize=rl.letter)
     elements = []
     
-    # Get styles
-    styles = getSampleStyleSheet()
-    title_style = styles['Heading1']
-    subtitle_style = styles['Heading2']
+    # Styles are built once and shared by every receipt
+    pdf = pdf_styles()
+    styles, table_style = pdf.sheet, pdf.receipt_table
     normal_style = styles['Normal']
     
-    # Add custom styles
-    styles.add(ParagraphStyle(
-        name='RightAlign',
-        parent=styles['Normal'],
-        alignment=2,  # 2 is right alignment
-    ))
-    
     # Add title
-    elements.append(Paragraph("Receipt", title_style))
+    elements.append(copy.copy(_receipt_paragraph("Receipt", 'Heading1')))
     
     # Add date
     timestamp = receipt['timestamp']
     if isinstance(timestamp, str):
-        try:
-            # Parse ISO format timestamp
-            dt = datetime.datetime.fromisoformat(timestamp)
-            date_str = dt.strftime("%Y-%m-%d %H:%M:%S")
-        except ValueError:
-            date_str = timestamp
+        # Receipts carry ISO timestamps to the second; only the separator
+        # differs from the printed form, so there is nothing to parse
+        date_str = timestamp.replace("T", " ")
     else:
         date_str = timestamp.strftime("%Y-%m-%d %H:%M:%S")
     
-    elements.append(Paragraph(f"Date: {date_str}", normal_style))
-    elements.append(Spacer(1, 0.2 * inch))
+    elements.append(rl.Paragraph(f"Date: {date_str}", normal_style))
+    elements.append(rl.Spacer(1, 0.2 * rl.inch))
     
-    # Create table for items
-    data = [["Item", "Quantity", "Price", "Total"]]
-    for name, qty, price, line in receipt['items']:
-        data.append([name, str(qty), f"{currency}{price:.2f}", f"{currency}{line:.2f}"])
+    # Create table for items; the amount format is bound once for all rows
+    money = (currency.replace("{", "{{").replace("}", "}}") + "{:.2f}").format
+    data = [list(PDF_RECEIPT_HEADER)]
+    data.extend([name, str(qty), money(price), money(line)]
+                for name, qty, price, line in receipt['items'])
     
     # Add summary rows
-    data.append(["" for _ in range(4)])
-    data.append(["Subtotal:", "", "", f"{currency}{receipt['subtotal']:.2f}"])
-    data.append(["Tax:", "", "", f"{currency}{receipt['taxed'] - receipt['subtotal']:.2f}"])
-    data.append(["Discount:", "", "", f"{currency}{receipt['discount']:.2f}"])
-    data.append(["Total:", "", "", f"{currency}{receipt['total']:.2f}"])
+    subtotal = receipt['subtotal']
+    data += [
+        ["", "", "", ""],
+        ["Subtotal:", "", "", money(subtotal)],
+        ["Tax:", "", "", money(receipt['taxed'] - subtotal)],
+        ["Discount:", "", "", money(receipt['discount'])],
+        ["Total:", "", "", money(receipt['total'])],
+    ]
     
     # Add payment method if available
     if 'payment_method' in receipt:
         data.append(["Payment Method:", receipt['payment_method'], "", ""])
     
     # Create the table
-    table = Table(data, colWidths=[2.5*inch, 1*inch, 1*inch, 1*inch])
+    table = rl.Table(data, colWidths=[2.5*rl.inch, 1*rl.inch, 1*rl.inch, 1*rl.inch])
     
     # Style the table
-    table_style = TableStyle([
-        ('BACKGROUND', (0, 0), (3, 0), colors.grey),
-        ('TEXTCOLOR', (0, 0), (3, 0), colors.whitesmoke),
-        ('ALIGN', (0, 0), (3, 0), 'CENTER'),
-        ('FONTNAME', (0, 0), (3, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (3, 0), 12),
-        ('BOTTOMPADDING', (0, 0), (3, 0), 12),
-        ('BACKGROUND', (0, 1), (3, -1), colors.white),
-        ('GRID', (0, 0), (-1, -2), 1, colors.black),
-        ('ALIGN', (1, 1), (3, -1), 'RIGHT'),
-        ('FONTNAME', (0, -5), (3, -1), 'Helvetica-Bold'),
-    ])
     table.setStyle(table_style)
     
     elements.append(table)
-    elements.append(Spacer(1, 0.5 * inch))
+    elements.append(rl.Spacer(1, 0.5 * rl.inch))
     
     # Add thank you message
-    elements.append(Paragraph("Thank you for your purchase!", styles['RightAlign']))
+    elements.append(copy.copy(_receipt_paragraph("Thank you for your purchase!", 'RightAlign')))
     
     # Build the PDF
     doc.build(elements)
@@ -177,104 +386,106 @@ def generate_pdf_receipt(receipt: dict, file_path: str, currency="$"):
 
 
 def generate_sales_report(db: Database, start_date=None, end_date=None, file_path=None, format='csv'):
-    """Generate a sales report for a given date range."""
-    # Get sales data
-    sales = db.list_sales(start_date, end_date)
+    """
+    Generate a sales report for a given date range.
+
+    The summary comes straight from SQLite's aggregates; the sales are only
+    fetched into a DataFrame when a file_path is given to write them to,
+    otherwise None is returned in its place.
+    """
+    # Summary statistics come from SQLite's aggregates, the same ones the
+    # report tab shows, rather than a pass over the rows
+    stats = db.get_sales_summary(start_date, end_date)
     
-    if not sales:
+    if not stats['count']:
         return None, "No sales data found for the specified period."
     
-    # Create DataFrame
-    df = pd.DataFrame(sales)
-    
-    # Calculate summary statistics
-    total_sales = df['total_amount'].sum()
-    avg_sale = df['total_amount'].mean()
-    num_transactions = len(df)
-    
-    # Format dates for better readability
-    df['timestamp'] = pd.to_datetime(df['timestamp'])
-    df['date'] = df['timestamp'].dt.date
-    
     # Create summary dict
     summary = {
-        'total_sales': total_sales,
-        'average_sale': avg_sale,
-        'num_transactions': num_transactions,
-        'start_date': start_date or df['date'].min(),
-        'end_date': end_date or df['date'].max()
+        'total_sales': stats['total'],
+        'average_sale': stats['avg'],
+        'num_transactions': stats['count'],
+        'best_item': stats['best_item'],
+        'start_date': start_date or stats['first_ts'][:10],
+        'end_date': end_date or stats['last_ts'][:10]
     }
     
-    # Export to file if path provided
-    if file_path:
-        if format.lower() == 'excel':
-            df.to_excel(file_path, index=False, sheet_name='Sales')
-        else:  # Default to CSV
-            df.to_csv(file_path, index=False)
+    # Summary-only calls never materialize the sales
+    if not file_path:
+        return None, summary
+    
+    df = _rows_to_frame(db.list_sales(start_date, end_date))
+    
+    # Timestamps are ISO text, so the date is a slice, not a parse
+    df['date'] = df['timestamp'].str[:10]
+    
+    # Export to file
+    if format.lower() == 'excel':
+        _frame_to_excel(df, file_path, 'Sales')
+    else:  # Default to CSV
+        df.to_csv(file_path, index=False)
     
     return df, summary
 
 
 def generate_inventory_report(db: Database, file_path=None, format='csv', low_stock_threshold=10):
-    """Generate an inventory report, optionally highlighting low stock items."""
-    # Get inventory data
-    inventory = db.list_inventory()
+    """
+    Generate an inventory report, optionally highlighting low stock items.
+
+    As with generate_sales_report, the products are only loaded into a
+    DataFrame when a file_path is given; otherwise None is returned for it.
+    """
+    # Count, stock value and the low stock list come from SQLite; the low
+    # stock rows are already just the matching products, as dicts
+    summary = db.get_inventory_summary()
     
-    if not inventory:
+    if not summary['total_items']:
         return None, "No inventory data found."
     
-    # Create DataFrame
-    df = pd.DataFrame(inventory)
+    low_stock_items = [dict(row) for row in db.get_low_stock_products(low_stock_threshold)]
+    summary['low_stock_count'] = len(low_stock_items)
+    summary['low_stock_items'] = low_stock_items
     
-    # Calculate summary statistics
-    total_items = len(df)
-    total_value = (df['price'] * df['quantity_in_stock']).sum()
-    low_stock_items = df[df['quantity_in_stock'] <= low_stock_threshold]
+    # Summary-only calls never materialize the inventory
+    if not file_path:
+        return None, summary
     
-    # Create summary dict
-    summary = {
-        'total_items': total_items,
-        'total_value': total_value,
-        'low_stock_count': len(low_stock_items),
-        'low_stock_items': low_stock_items.to_dict('records') if not low_stock_items.empty else []
-    }
+    df = _rows_to_frame(db.list_inventory())
     
-    # Export to file if path provided
-    if file_path:
-        if format.lower() == 'excel':
-            df.to_excel(file_path, index=False, sheet_name='Inventory')
-        else:  # Default to CSV
-            df.to_csv(file_path, index=False)
+    # Export to file
+    if format.lower() == 'excel':
+        _frame_to_excel(df, file_path, 'Inventory')
+    else:  # Default to CSV
+        df.to_csv(file_path, index=False)
     
     return df, summary
 
 
 def generate_pdf_report(title, data, summary, file_path):
     """Generate a PDF report with data and summary statistics."""
-    if not REPORTLAB_AVAILABLE:
-        raise ImportError("ReportLab is not installed. Cannot generate PDF report.")
+    rl = load_reportlab()
+    pd = load_pandas()
     
-    # Create the PDF document
-    doc = SimpleDocTemplate(file_path, pagesize=letter)
     elements = []
     
-    # Get styles
-    styles = getSampleStyleSheet()
+    # Styles are built once and shared by every report
+    pdf = pdf_styles()
+    styles, summary_table_style, data_table_style = pdf.sheet, pdf.report_summary, pdf.report_data
     title_style = styles['Heading1']
     subtitle_style = styles['Heading2']
     normal_style = styles['Normal']
     
     # Add title
-    elements.append(Paragraph(title, title_style))
-    elements.append(Spacer(1, 0.2 * inch))
+    elements.append(rl.Paragraph(title, title_style))
+    elements.append(rl.Spacer(1, 0.2 * rl.inch))
     
     # Add date
     current_date = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    elements.append(Paragraph(f"Generated: {current_date}", normal_style))
-    elements.append(Spacer(1, 0.2 * inch))
+    elements.append(rl.Paragraph(f"Generated: {current_date}", normal_style))
+    elements.append(rl.Spacer(1, 0.2 * rl.inch))
     
     # Add summary section
-    elements.append(Paragraph("Summary", subtitle_style))
+    elements.append(rl.Paragraph("Summary", subtitle_style))
     
     # Create summary table
     summary_data = [["Metric", "Value"]]
@@ -293,57 +504,33 @@ def generate_pdf_report(title, data, summary, file_path):
             summary_data.append([display_key, formatted_value])
     
     # Create the summary table
-    summary_table = Table(summary_data, colWidths=[2.5*inch, 3*inch])
-    summary_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (1, 0), colors.grey),
-        ('TEXTCOLOR', (0, 0), (1, 0), colors.whitesmoke),
-        ('ALIGN', (0, 0), (1, 0), 'CENTER'),
-        ('FONTNAME', (0, 0), (1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (1, 0), 12),
-        ('BOTTOMPADDING', (0, 0), (1, 0), 12),
-        ('BACKGROUND', (0, 1), (1, -1), colors.white),
-        ('GRID', (0, 0), (1, -1), 1, colors.black),
-    ]))
+    summary_table = rl.Table(summary_data, colWidths=[2.5*rl.inch, 3*rl.inch])
+    summary_table.setStyle(summary_table_style)
     
     elements.append(summary_table)
-    elements.append(Spacer(1, 0.3 * inch))
+    elements.append(rl.Spacer(1, 0.3 * rl.inch))
     
     # Add data section if we have a DataFrame
     if isinstance(data, pd.DataFrame) and not data.empty:
-        elements.append(Paragraph("Detailed Data", subtitle_style))
-        
-        # Convert DataFrame to a list of lists for the table
-        table_data = [data.columns.tolist()]
-        for _, row in data.iterrows():
-            table_data.append([str(x) for x in row.tolist()])
-        
-        # Create the data table (limit to first 50 rows to avoid huge PDFs)
-        max_rows = min(50, len(table_data))
-        data_table = Table(table_data[:max_rows], colWidths=None)  # Auto-width
-        
-        # Style the table
-        table_style = TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, 0), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.white),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-            ('FONTSIZE', (0, 1), (-1, -1), 8),
-        ])
-        data_table.setStyle(table_style)
-        
-        elements.append(data_table)
+        elements.append(rl.Paragraph("Detailed Data", subtitle_style))
         
-        # Add note if we limited the rows
-        if len(table_data) > max_rows:
-            elements.append(Spacer(1, 0.2 * inch))
-            elements.append(Paragraph(f"Note: Showing {max_rows} of {len(table_data)-1} rows", 
-                                    styles['Italic']))
-    
-    # Build the PDF
-    doc.build(elements)
+        # Lay the rows out as a run of fixed-size tables; ReportLab's cost per
+        # table grows faster than its row count, so short tables keep whole
+        # reports affordable. The tables flow one after another and split
+        # across pages where needed, repeating their header row
+        header = data.columns.tolist()
+        # Cells are stringified in one NumPy pass; missing values print blank
+        rows = data.to_numpy(dtype=object, na_value='').astype(str).tolist()
+        for start in range(0, len(rows), PDF_REPORT_TABLE_ROWS):
+            data_table = rl.Table([header] + rows[start:start + PDF_REPORT_TABLE_ROWS],
+                                  colWidths=None, repeatRows=1)  # Auto-width
+            data_table.setStyle(data_table_style)
+            elements.append(data_table)
+    
+    # Build the PDF into a buffered handle opened only once the content is
+    # ready; pages are compressed so the finished document stays small
+    with open(file_path, 'wb', buffering=EXPORT_BUFFER_SIZE) as f:
+        doc = rl.SimpleDocTemplate(f, pagesize=rl.letter, pageCompression=1)
+        doc.build(elements)
     
     return file_path